@@ -0,0 +1,168 @@
+"""Admission control for the word submission endpoints.
+
+Covers every ``/api/.../submit_word`` route (solo, rooms, daily) and the
+submit_words batch. A WSGI middleware in front of Flask, so a rejected request never has its
+session loaded or a word looked up. Two checks, both O(1):
+
+- a token bucket per session (SUBMIT_RATE words per second, bursts of up to
+  SUBMIT_BURST). A submit_words batch costs one token per word, counted
+  from its body. Buckets live in an LRU-ordered dict capped at
+  RATE_LIMIT_KEYS entries; an evicted bucket simply starts full again.
+- a cap of SUBMIT_MAX_CONCURRENT submissions in flight in this process.
+
+Either one answers 429 with a Retry-After header. Sessions are identified
+by the signed session ID in the cookie, so a forged or rotated cookie
+doesn't buy a fresh bucket: requests without a valid one share a bucket per
+client address. Limits are per process; with N gunicorn workers a session
+can get up to N times SUBMIT_RATE.
+"""
+import io
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from werkzeug.http import parse_cookie
+
+from metrics import Counter
+
+BATCH_PATH = '/api/submit_words'
+LIMITED_SUFFIXES = ('/submit_word', BATCH_PATH)
+RATE_LIMITED_MESSAGE = 'Too many words too fast, slow down!'
+MAX_BATCH_BODY = 64 * 1024  # Bigger batch bodies are charged a full bucket without being parsed
+
+ADMISSION_REJECTIONS = Counter(
+    'admission_rejections_total', 'Word submissions refused before reaching the game', ('reason',)
+)
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client, least recently used evicted first"""
+
+    def __init__(self, rate, burst, max_keys=100000):
+        self._rate = rate
+        self._burst = burst
+        self._max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, updated]
+        self._lock = threading.Lock()
+
+    def take(self, key, cost=1, now=None):
+        """Spend cost tokens for key; returns 0 if allowed, else seconds until it would be.
+
+        A cost above the burst size needs a full bucket and leaves it in debt,
+        so a big batch goes through once and is paid for afterwards.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self._burst, now]
+                if len(self._buckets) > self._max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+                bucket[1] = now
+            needed = min(cost, self._burst)
+            if bucket[0] >= needed:
+                bucket[0] -= cost
+                return 0
+            return (needed - bucket[0]) / self._rate
+
+    @property
+    def burst(self):
+        return self._burst
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class AdmissionControl:
+    def __init__(self, wsgi_app, app, limiter, max_concurrent):
+        self.wsgi_app = wsgi_app
+        self._app = app
+        self._limiter = limiter
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def client_key(self, environ):
+        """The session ID from a validly signed cookie, else the client address"""
+        interface = self._app.session_interface
+        cookie = environ.get('HTTP_COOKIE')
+        if cookie and hasattr(interface, 'sid_from_cookie'):
+            value = parse_cookie(cookie).get(interface.get_cookie_name(self._app))
+            sid = interface.sid_from_cookie(self._app, value)
+            if sid is not None:
+                return sid
+        return 'addr:' + environ.get('REMOTE_ADDR', '')
+
+    def __call__(self, environ, start_response):
+        if not is_limited(environ):
+            return self.wsgi_app(environ, start_response)
+
+        cost = batch_cost(environ, self._limiter) if environ['PATH_INFO'] == BATCH_PATH else 1
+        wait = self._limiter.take(self.client_key(environ), cost)
+        if wait:
+            ADMISSION_REJECTIONS.inc('rate')
+            return reject(start_response, RATE_LIMITED_MESSAGE, wait)
+        if not self._slots.acquire(blocking=False):
+            ADMISSION_REJECTIONS.inc('concurrency')
+            return reject(start_response, 'Server busy, try again', 1)
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            self._slots.release()
+
+
+def is_limited(environ):
+    path = environ.get('PATH_INFO', '')
+    return environ.get('REQUEST_METHOD') == 'POST' and path.startswith('/api/') and path.endswith(LIMITED_SUFFIXES)
+
+
+def batch_cost(environ, limiter):
+    """Number of words in a submit_words body (which is put back for Flask to read)"""
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return 1
+    if length > MAX_BATCH_BODY:
+        return limiter.burst
+    body = environ['wsgi.input'].read(length) if length > 0 else b''
+    environ['wsgi.input'] = io.BytesIO(body)
+    try:
+        words = json.loads(body).get('words')
+    except (ValueError, AttributeError):
+        return 1
+    return max(1, len(words)) if isinstance(words, list) else 1
+
+
+def reject(start_response, message, retry_after):
+    body = json.dumps({'success': False, 'message': message, 'rate_limited': True}).encode()
+    start_response('429 Too Many Requests', [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(body))),
+        ('Retry-After', str(math.ceil(retry_after)))
+    ])
+    return [body]
+
+
+def create_limiter():
+    """The per-session word limiter configured by SUBMIT_RATE and friends, or None if RATE_LIMIT=off"""
+    if os.environ.get('RATE_LIMIT', 'on') == 'off':
+        return None
+    return TokenBucketLimiter(
+        rate=float(os.environ.get('SUBMIT_RATE', 5)),
+        burst=float(os.environ.get('SUBMIT_BURST', 15)),
+        max_keys=int(os.environ.get('RATE_LIMIT_KEYS', 100000))
+    )
+
+
+def install_admission_control(app):
+    """Wrap app.wsgi_app with admission control unless RATE_LIMIT=off"""
+    limiter = create_limiter()
+    if limiter is None:
+        return
+    max_concurrent = int(os.environ.get('SUBMIT_MAX_CONCURRENT', 16))
+    app.wsgi_app = AdmissionControl(app.wsgi_app, app, limiter, max_concurrent)
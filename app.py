@@ -2,69 +2,112 @@ from flask import Flask, request, jsonify, session, render_template
 import os
 import random
 import string
+import secrets
 import json
-import requests
-from datetime import datetime
+import math
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+
+from admission import install_admission_control
+from board import find_word_path, letter_counts, letter_mask, neighbor_table, solve_grid
+from event_log import create_event_log
+from grid_pool import GridPool
+from hints import HintEngine
+from leaderboard import create_leaderboard
+from lexicon import Lexicon, MIN_WORD_LENGTH, load_lexicon, normalize_word
+from log_config import configure_logging
+from metrics import EFFECT_BONUSES, instrument, render as render_metrics, stage
+from payloads import StaticPayload, compress_response
+from rooms import RoomEngine, create_room_bus
+from state_store import create_session_interface
+
+configure_logging()
+log = logging.getLogger('app')
+scoring_log = logging.getLogger('app.scoring')
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'fallback-secret-key-for-development')
 
-# WORD DICTIONARY API
+# Compact UTF-8 JSON: no whitespace, no \u escapes for the card icons, no key sorting
+app.json.compact = True
+app.json.ensure_ascii = False
+app.json.sort_keys = False
+
+@app.after_request
+def compress_json(response):
+    return compress_response(response, request.headers.get('Accept-Encoding'))
+
+# Game state lives server-side; the cookie only holds a signed session ID
+session_interface = create_session_interface(app)
+if session_interface is not None:
+    app.session_interface = session_interface
+
+# Per-route latency, session decode/encode timing and the opt-in profiler (see metrics.py)
+instrument(app)
+# Per-session rate limit on word submissions, checked before the session is loaded
+install_admission_control(app)
+
+# WORD DICTIONARY
+# Seed words used when no full word list is deployed (see WORDLIST_PATH)
+COMMON_WORDS = frozenset({
+    'cat', 'dog', 'run', 'jump', 'play', 'game', 'word', 'test', 'code',
+    'help', 'work', 'time', 'life', 'love', 'home', 'good', 'best', 'new',
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had',
+    'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his',
+    'how', 'man', 'may', 'old', 'see', 'two', 'way', 'who', 'boy', 'did',
+    'its', 'let', 'put', 'say', 'she', 'too', 'use', 'big', 'end', 'far',
+    'got', 'own', 'off', 'ask', 'cut', 'lot', 'why', 'top', 'act', 'car',
+    'yet', 'yes', 'win', 'war', 'try', 'box', 'bit', 'bat', 'bag', 'art',
+    'age', 'ago', 'air', 'all', 'any', 'arm', 'bad', 'bed', 'buy', 'can',
+    'day', 'ear', 'eat', 'eye', 'few', 'fly', 'fun', 'get', 'guy', 'hit',
+    'hot', 'ice', 'job', 'key', 'law', 'lay', 'leg', 'lie', 'low', 'map',
+    'mix', 'new', 'oil', 'old', 'out', 'pay', 'red', 'run', 'sea', 'set',
+    'sit', 'six', 'sky', 'sun', 'tea', 'ten', 'try', 'war', 'way', 'win',
+    'able', 'back', 'ball', 'bank', 'base', 'beat', 'been', 'bell', 'bill',
+    'bird', 'blow', 'blue', 'boat', 'body', 'book', 'born', 'both', 'boys',
+    'came', 'call', 'care', 'case', 'city', 'come', 'cool', 'copy', 'cost',
+    'data', 'date', 'days', 'deal', 'deep', 'does', 'done', 'door', 'down',
+    'each', 'easy', 'else', 'even', 'ever', 'eyes', 'face', 'fact', 'fail',
+    'fall', 'fast', 'feel', 'feet', 'fell', 'felt', 'file', 'fill', 'find',
+    'fine', 'fire', 'fish', 'five', 'food', 'foot', 'form', 'four', 'free',
+    'from', 'full', 'gave', 'girl', 'give', 'goes', 'gold', 'gone', 'gray',
+    'grew', 'grow', 'hair', 'half', 'hall', 'hand', 'hard', 'head', 'hear',
+    'heat', 'held', 'help', 'here', 'high', 'hold', 'home', 'hope', 'hour',
+    'huge', 'idea', 'into', 'item', 'join', 'jump', 'just', 'keep', 'kept',
+    'kids', 'kind', 'knew', 'know', 'land', 'last', 'late', 'left', 'less',
+    'life', 'like', 'line', 'list', 'live', 'long', 'look', 'lost', 'lots',
+    'made', 'make', 'many', 'mean', 'meet', 'mind', 'miss', 'more', 'most',
+    'move', 'much', 'must', 'name', 'near', 'need', 'news', 'next', 'nice',
+    'nine', 'none', 'note', 'once', 'only', 'open', 'over', 'page', 'paid',
+    'part', 'past', 'plan', 'poor', 'pull', 'push', 'read', 'real', 'rest',
+    'rich', 'ride', 'ring', 'rise', 'road', 'rock', 'role', 'room', 'safe',
+    'said', 'same', 'save', 'seen', 'seem', 'self', 'sell', 'send', 'sent',
+    'ship', 'shop', 'show', 'side', 'sign', 'site', 'size', 'skin', 'slow',
+    'snow', 'soft', 'soil', 'sold', 'some', 'song', 'soon', 'sort', 'star',
+    'stay', 'step', 'stop', 'such', 'sure', 'take', 'talk', 'team', 'tell',
+    'than', 'that', 'them', 'then', 'they', 'this', 'thus', 'till', 'tiny',
+    'told', 'took', 'tree', 'trip', 'true', 'turn', 'used', 'user', 'very',
+    'view', 'wait', 'walk', 'wall', 'want', 'warm', 'wash', 'wave', 'ways',
+    'wear', 'week', 'well', 'went', 'were', 'what', 'when', 'will', 'wind',
+    'wish', 'with', 'wood', 'word', 'wore', 'work', 'yard', 'year', 'your'
+})
+
+LEXICON = load_lexicon()
+if LEXICON is None:
+    # Development only: the same few hundred words are the dictionary for every mode
+    log.warning("no word list found, falling back to built-in common words")
+    LEXICON = Lexicon.from_words(COMMON_WORDS)
+
 def validate_word_api(word):
-    """Validate word using dictionary API with robust fallback"""
-    # Greatly expanded fallback word list for faster validation
-    common_words = {
-        'cat', 'dog', 'run', 'jump', 'play', 'game', 'word', 'test', 'code',
-        'help', 'work', 'time', 'life', 'love', 'home', 'good', 'best', 'new',
-        'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had',
-        'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his',
-        'how', 'man', 'may', 'old', 'see', 'two', 'way', 'who', 'boy', 'did',
-        'its', 'let', 'put', 'say', 'she', 'too', 'use', 'big', 'end', 'far',
-        'got', 'own', 'off', 'ask', 'cut', 'lot', 'why', 'top', 'act', 'car',
-        'yet', 'yes', 'win', 'war', 'try', 'box', 'bit', 'bat', 'bag', 'art',
-        'age', 'ago', 'air', 'all', 'any', 'arm', 'bad', 'bed', 'buy', 'can',
-        'day', 'ear', 'eat', 'eye', 'few', 'fly', 'fun', 'get', 'guy', 'hit',
-        'hot', 'ice', 'job', 'key', 'law', 'lay', 'leg', 'lie', 'low', 'map',
-        'mix', 'new', 'oil', 'old', 'out', 'pay', 'red', 'run', 'sea', 'set',
-        'sit', 'six', 'sky', 'sun', 'tea', 'ten', 'try', 'war', 'way', 'win',
-        'able', 'back', 'ball', 'bank', 'base', 'beat', 'been', 'bell', 'bill',
-        'bird', 'blow', 'blue', 'boat', 'body', 'book', 'born', 'both', 'boys',
-        'came', 'call', 'care', 'case', 'city', 'come', 'cool', 'copy', 'cost',
-        'data', 'date', 'days', 'deal', 'deep', 'does', 'done', 'door', 'down',
-        'each', 'easy', 'else', 'even', 'ever', 'eyes', 'face', 'fact', 'fail',
-        'fall', 'fast', 'feel', 'feet', 'fell', 'felt', 'file', 'fill', 'find',
-        'fine', 'fire', 'fish', 'five', 'food', 'foot', 'form', 'four', 'free',
-        'from', 'full', 'gave', 'girl', 'give', 'goes', 'gold', 'gone', 'gray',
-        'grew', 'grow', 'hair', 'half', 'hall', 'hand', 'hard', 'head', 'hear',
-        'heat', 'held', 'help', 'here', 'high', 'hold', 'home', 'hope', 'hour',
-        'huge', 'idea', 'into', 'item', 'join', 'jump', 'just', 'keep', 'kept',
-        'kids', 'kind', 'knew', 'know', 'land', 'last', 'late', 'left', 'less',
-        'life', 'like', 'line', 'list', 'live', 'long', 'look', 'lost', 'lots',
-        'made', 'make', 'many', 'mean', 'meet', 'mind', 'miss', 'more', 'most',
-        'move', 'much', 'must', 'name', 'near', 'need', 'news', 'next', 'nice',
-        'nine', 'none', 'note', 'once', 'only', 'open', 'over', 'page', 'paid',
-        'part', 'past', 'plan', 'poor', 'pull', 'push', 'read', 'real', 'rest',
-        'rich', 'ride', 'ring', 'rise', 'road', 'rock', 'role', 'room', 'safe',
-        'said', 'same', 'save', 'seen', 'seem', 'self', 'sell', 'send', 'sent',
-        'ship', 'shop', 'show', 'side', 'sign', 'site', 'size', 'skin', 'slow',
-        'snow', 'soft', 'soil', 'sold', 'some', 'song', 'soon', 'sort', 'star',
-        'stay', 'step', 'stop', 'such', 'sure', 'take', 'talk', 'team', 'tell',
-        'than', 'that', 'them', 'then', 'they', 'this', 'thus', 'till', 'tiny',
-        'told', 'took', 'tree', 'trip', 'true', 'turn', 'used', 'user', 'very',
-        'view', 'wait', 'walk', 'wall', 'want', 'warm', 'wash', 'wave', 'ways',
-        'wear', 'week', 'well', 'went', 'were', 'what', 'when', 'will', 'wind',
-        'wish', 'with', 'wood', 'word', 'wore', 'work', 'yard', 'year', 'your'
-    }
-    
-    # Check common words first for speed
-    if word.lower() in common_words:
-        return {'valid': True, 'definition': 'Common word', 'phonetic': ''}
-    
-    # For words 3+ letters not in common list, accept as valid (avoids API issues)
-    if len(word) >= 3:
+    """Validate word against the loaded lexicon"""
+    if len(word) >= MIN_WORD_LENGTH and word in LEXICON:
         return {'valid': True, 'definition': 'Valid word', 'phonetic': ''}
-    
-    # Only reject very short words
     return {'valid': False, 'definition': '', 'phonetic': ''}
 
 # POWER CARD SYSTEM WITH UPGRADE TREES
@@ -191,23 +234,222 @@ POWER_CARDS = [
     }
 ]
 
-def init_game_state():
+EFFECT_CARDS = [
+    {
+        'id': 'time_freeze',
+        'name': 'Time Freeze',
+        'description': 'Pause timer for 10 seconds',
+        'icon': '⏸️',
+        'cost': 30,
+        'type': 'effect'
+    },
+    {
+        'id': 'shuffle_board',
+        'name': 'Shuffle Board',
+        'description': 'Randomize all letters',
+        'icon': '🔀',
+        'cost': 25,
+        'type': 'effect'
+    },
+    {
+        'id': 'combo_letters',
+        'name': 'Combo Letters',
+        'description': 'Add 3 high-value letters',
+        'icon': '💎',
+        'cost': 40,
+        'type': 'effect'
+    },
+    {
+        'id': 'word_highlight',
+        'name': 'Word Highlight',
+        'description': 'Highlight a valid 5+ letter word',
+        'icon': '💡',
+        'cost': 35,
+        'type': 'effect'
+    },
+    {
+        'id': 'double_points',
+        'name': 'Double Points',
+        'description': 'Next word scores double points',
+        'icon': '⚡',
+        'cost': 45,
+        'type': 'effect'
+    }
+]
+
+PACKS = [
+    {
+        'id': 'power_pack',
+        'name': 'Power Pack',
+        'description': '3 random Power Cards',
+        'icon': '📦',
+        'cost': 100
+    },
+    {
+        'id': 'spell_pack', 
+        'name': 'Spell Pack',
+        'description': '1-use grid modifiers',
+        'icon': '✨',
+        'cost': 80
+    }
+]
+
+def build_card_registry(cards):
+    """Index cards and their upgrades by ID (read-only)"""
+    registry = {}
+    for card in cards:
+        registry[card['id']] = card
+        for upgrade in card.get('upgrades', []):
+            registry[upgrade['id']] = {**upgrade, 'is_upgrade': True, 'parent_id': card['id']}
+    return MappingProxyType(registry)
+
+# Game state stores owned cards as IDs into these registries
+CARD_REGISTRY = build_card_registry(POWER_CARDS)
+EFFECT_CARD_REGISTRY = build_card_registry(EFFECT_CARDS)
+PACK_REGISTRY = build_card_registry(PACKS)
+
+# Everything in the shop that is the same for every player, encoded once
+SHOP_CATALOG = StaticPayload({
+    'power_cards': POWER_CARDS,
+    'packs': PACKS,
+    'effect_cards': EFFECT_CARDS
+})
+
+SHOP_OFFER_SIZE = 5
+
+@lru_cache(maxsize=4096)
+def shop_offer(run_seed, ante, round_number):
+    """Card IDs offered in the shop for one round of one run (deterministic)"""
+    rng = random.Random(f"{run_seed}:{ante}:{round_number}")
+    return tuple(card['id'] for card in rng.sample(POWER_CARDS, min(SHOP_OFFER_SIZE, len(POWER_CARDS))))
+
+# Effect types that change a word's score; the rest act on the grid or timer
+SCORING_EFFECTS = ('vowel_bonus', 'repeat_bonus', 'score_multiplier', 'anagram_bonus', 'grid_modifier')
+
+def compile_scoring_plan(power_deck):
+    """Fold a deck of card IDs into one aggregate entry per scoring effect.
+
+    Run once whenever the deck changes, so scoring a word costs the same no
+    matter how many cards are owned.
+    """
+    plan = {}
+    names = {}
+    for card_id in power_deck:
+        card = CARD_REGISTRY[card_id]
+        effect_type = card['effect_type']
+        if effect_type not in SCORING_EFFECTS:
+            continue
+        entry = plan.setdefault(effect_type, {'value': 0, 'count': 0, 'icon': card['icon']})
+        entry['value'] += card['value']
+        entry['count'] += 1
+        counts = names.setdefault(effect_type, {})
+        counts[card['name']] = counts.get(card['name'], 0) + 1
+    
+    for effect_type, counts in names.items():
+        plan[effect_type]['card_name'] = ' + '.join(
+            name if count == 1 else f"{name} x{count}" for name, count in counts.items()
+        )
+    return plan
+
+def expand_cards(card_ids, registry):
+    """Turn stored card IDs back into full card dicts for the client"""
+    return [registry[card_id] for card_id in card_ids]
+
+# Derived state the client never needs
+SERVER_ONLY_KEYS = frozenset({
+    'scoring_plan', 'key_revisions', 'run_seed', 'round_ends_at', 'highlighted_words'
+})
+
+def client_game_state(game_state, keys=None):
+    """Game state (or just keys) as sent to the client, with owned cards expanded"""
+    if keys is None:
+        keys = game_state.keys()
+    state = {key: game_state[key] for key in keys if key not in SERVER_ONLY_KEYS}
+    if 'found_word_masks' in state:
+        # The client gets the words alone, in the order found
+        state['found_words'] = list(state.pop('found_word_masks'))
+    if 'power_deck' in state:
+        state['power_deck'] = expand_cards(game_state['power_deck'], CARD_REGISTRY)
+    if 'effect_cards' in state:
+        state['effect_cards'] = expand_cards(game_state['effect_cards'], EFFECT_CARD_REGISTRY)
+    if 'time_remaining' in state and game_state['game_phase'] == 'playing':
+        state['time_remaining'] = math.ceil(round_time_left(game_state))
+    return state
+
+def touch_state(game_state, *keys):
+    """Start a new revision and record keys (default: all) as changed in it"""
+    revision = game_state['revision'] + 1
+    game_state['revision'] = revision
+    key_revisions = game_state['key_revisions']
+    for key in keys or game_state.keys():
+        if key not in SERVER_ONLY_KEYS:
+            key_revisions[key] = revision
+
+def game_state_payload(game_state, since=None):
+    """Full client state, or only the keys changed after revision since.
+
+    A since the server can't answer from (newer than the current revision)
+    gets the full state so the client can resync.
+    """
+    revision = game_state['revision']
+    if since is None or not 0 <= since <= revision:
+        return {'revision': revision, 'game_state': client_game_state(game_state)}
+    changed = [key for key, key_revision in game_state['key_revisions'].items() if key_revision > since]
+    return {'revision': revision, 'since': since, 'changes': client_game_state(game_state, changed)}
+
+def requested_since():
+    """The revision a client already has, from ?since= or a JSON body field"""
+    since = request.args.get('since', type=int)
+    if since is None and request.is_json:
+        since = (request.get_json(silent=True) or {}).get('since')
+    return since if isinstance(since, int) else None
+
+def state_response(game_state):
+    """JSON response body for endpoints that hand back the game state"""
+    since = requested_since()
+    if since is None:
+        # Older clients: full state, unchanged shape
+        return {'success': True, 'revision': game_state['revision'], 'game_state': client_game_state(game_state)}
+    return {'success': True, **game_state_payload(game_state, since)}
+
+# Append-only log of state transitions for offline analytics (see event_log.py)
+EVENT_LOG = create_event_log(app)
+
+def record_event(kind, game_state, **fields):
+    if EVENT_LOG is not None:
+        EVENT_LOG.append(kind, {
+            'run': game_state['run_seed'],
+            'ante': game_state['ante'],
+            'round': game_state['round'],
+            **fields
+        })
+
+def init_game_state(revision=0):
     """Initialize new game state"""
-    return {
+    game_state = {
+        'revision': revision,  # Bumped by touch_state on every change
+        'key_revisions': {},  # key -> revision it last changed in
+        'run_seed': random.getrandbits(64),  # Makes shop offers reproducible per round; also the run's ID in the event log
         'game_phase': 'menu',  # menu, challenge_select, playing, shop, game_over, victory
         'ante': 1,
         'round': 1,
         'score': 0,
         'goal_score': 100,  # More achievable goal
         'coins': 100,
-        'power_deck': [],  # Start with no power cards
-        'effect_cards': [],  # One-time use effect cards
+        'power_deck': [],  # Owned power card IDs, start with none
+        'effect_cards': [],  # One-time use effect card IDs
+        'scoring_plan': {},  # compile_scoring_plan(power_deck)
         'grid': generate_boggle_grid(),
         'time_remaining': 120,
+        'round_ends_at': None,  # Epoch seconds; the server's clock is the one that counts
+        'time_freeze_used': False,
+        'possible_words': 0,
+        'max_possible_score': 0,
 
-        'found_words': [],
+        'found_word_masks': {},  # word -> letter_mask(word) in the order found; sent as found_words
+        'highlighted_words': [],  # Shown by Word Highlight this round, so it never repeats one
         'current_word': '',
-        'last_round_letters': [],
+        'last_round_letters': {},  # letter -> count on last round's grid
         'combo_count': 0,
         'run_stats': {
             'total_words': 0,
@@ -215,91 +457,336 @@ def init_game_state():
             'rounds_completed': 0
         }
     }
+    touch_state(game_state)
+    return game_state
+
+# Letter weights roughly follow English letter frequency (per 1000 letters)
+LETTER_WEIGHTS = {
+    'E': 111, 'A': 85, 'R': 76, 'I': 75, 'O': 72, 'T': 70, 'N': 67, 'S': 57,
+    'L': 55, 'C': 45, 'U': 36, 'D': 34, 'P': 32, 'M': 30, 'H': 30, 'G': 25,
+    'B': 21, 'F': 18, 'Y': 18, 'W': 13, 'K': 11, 'V': 10, 'X': 3, 'Z': 3,
+    'J': 2, 'Q': 2
+}
+LETTERS = ''.join(LETTER_WEIGHTS)
+LETTER_CUM_WEIGHTS = list(itertools.accumulate(LETTER_WEIGHTS.values()))
+
+# Grid quality bar per difficulty tier: (highest goal_score in tier, grid size, min words).
+# The tiers cover the whole goal curve (about 41k by the last round of ante 8),
+# with bigger boards once a 5x5 can't offer enough; each board must also be
+# worth GRID_POTENTIAL_RATIO times the tier's highest goal in total word score.
+GRID_QUALITY_TIERS = [
+    (150, 5, 60),
+    (500, 5, 100),
+    (2000, 5, 150),
+    (6000, 6, 250),
+    (15000, 7, 400),
+    (45000, 8, 600)
+]
+GRID_POTENTIAL_RATIO = 3
+GRID_ATTEMPTS = 12
 
-def generate_boggle_grid(size=5):
-    """Generate a Boggle-style letter grid"""
-    # Weighted letter distribution similar to Boggle
-    vowels = 'AEIOU'
-    consonants = 'BCDFGHJKLMNPQRSTVWXYZ'
-    
-    grid = []
-    for i in range(size):
-        row = []
-        for j in range(size):
-            # 40% chance for vowel, 60% for consonant
-            if random.random() < 0.4:
-                letter = random.choice(vowels)
-            else:
-                letter = random.choice(consonants)
-            row.append(letter)
-        grid.append(row)
+def generate_boggle_grid(size=5, rng=random):
+    """Generate a Boggle-style letter grid (pass a seeded random.Random for a reproducible one)"""
+    letters = rng.choices(LETTERS, cum_weights=LETTER_CUM_WEIGHTS, k=size * size)
     
-    return grid
+    # A Q with no U beside it is close to unplayable, so give it one
+    neighbors = neighbor_table(size, size)
+    for index, letter in enumerate(letters):
+        if letter == 'Q' and not any(letters[n] == 'U' for n in neighbors[index]):
+            letters[rng.choice(neighbors[index])] = 'U'
+    
+    return [letters[row * size:(row + 1) * size] for row in range(size)]
+
+def grid_tier(goal_score):
+    """Map a goal score to its GRID_QUALITY_TIERS index"""
+    for tier, (max_goal, _, _) in enumerate(GRID_QUALITY_TIERS):
+        if goal_score <= max_goal:
+            return tier
+    return len(GRID_QUALITY_TIERS) - 1
+
+def generate_quality_grid(tier, rng=random):
+    """Generate grids until one meets the tier's quality bar; return (grid, solution).
 
-def calculate_word_score(word, power_deck, found_words, last_round_letters):
-    """Calculate score with power card effects"""
+    Falls back to the best candidate seen after GRID_ATTEMPTS tries, so a small
+    word list (or a goal no board can match) degrades grid quality instead of
+    failing. Runs in the grid pool's worker process, so it must not touch the
+    solution cache.
+    """
+    max_goal, size, min_words = GRID_QUALITY_TIERS[tier]
+    min_score = GRID_POTENTIAL_RATIO * max_goal
+    best = None
+    for _ in range(GRID_ATTEMPTS):
+        grid = generate_boggle_grid(size, rng)
+        solution = compute_board_solution(grid)
+        if solution['word_count'] >= min_words and solution['max_score'] >= min_score:
+            return grid, solution
+        if best is None or solution['max_score'] > best[1]['max_score']:
+            best = grid, solution
+    return best
+
+def calculate_word_score(word, scoring_plan, found_word_masks, last_round_letters):
+    """Calculate score with power card effects from a compiled scoring plan.
+
+    found_word_masks maps already-found words to their letter masks in
+    submission order; last_round_letters maps letters to counts.
+    """
     base_score = len(word) * 10
     bonus_score = 0
     effects = []
     
-    print(f"DEBUG: Calculating score for '{word}', base={base_score}, power_deck size={len(power_deck)}")
-    
-    # Apply power card effects
-    for card in power_deck:
+    # Apply power card effects, one aggregate per effect type
+    for effect_type, entry in scoring_plan.items():
         card_bonus = 0
-        effect_triggered = False
         
-        if card['effect_type'] == 'vowel_bonus':
+        if effect_type == 'vowel_bonus':
             vowel_count = sum(1 for c in word if c.lower() in 'aeiou')
-            if vowel_count > 0:
-                card_bonus = vowel_count * card['value']
-                effect_triggered = True
-                print(f"DEBUG: Vowel bonus: {vowel_count} vowels * {card['value']} = {card_bonus}")
+            card_bonus = vowel_count * entry['value']
             
-        elif card['effect_type'] == 'repeat_bonus' and last_round_letters:
-            repeat_count = sum(1 for c in word if c.upper() in last_round_letters)
-            if repeat_count > 0:
-                card_bonus = repeat_count * card['value']
-                effect_triggered = True
-                print(f"DEBUG: Repeat bonus: {repeat_count} repeats * {card['value']} = {card_bonus}")
+        elif effect_type == 'repeat_bonus' and last_round_letters:
+            repeat_count = sum(1 for c in word if c in last_round_letters)
+            card_bonus = repeat_count * entry['value']
             
-        elif card['effect_type'] == 'score_multiplier':
+        elif effect_type == 'score_multiplier':
             if len(word) >= 5:  # Lower threshold for more frequent activation
-                card_bonus = base_score  # Double the score
-                effect_triggered = True
-                print(f"DEBUG: Score multiplier: base {base_score} doubled = {card_bonus}")
+                card_bonus = base_score * entry['count']  # Each card doubles the base score
             
-        elif card['effect_type'] == 'anagram_bonus' and len(found_words) > 0:
+        elif effect_type == 'anagram_bonus' and found_word_masks:
             # Check if this word shares letters with previous word
-            prev_word = found_words[-1]
-            shared_letters = len(set(word.lower()) & set(prev_word.lower()))
+            prev_mask = next(reversed(found_word_masks.values()))
+            shared_letters = (letter_mask(word) & prev_mask).bit_count()
             if shared_letters >= 3:  # More lenient anagram check
-                card_bonus = card['value']
-                effect_triggered = True
-                print(f"DEBUG: Anagram bonus: {shared_letters} shared letters = {card_bonus}")
+                card_bonus = entry['value']
         
-        elif card['effect_type'] == 'grid_modifier':
+        elif effect_type == 'grid_modifier':
             # Always give a small bonus for grid modifier cards
-            card_bonus = 15 * card['value']
-            effect_triggered = True
-            print(f"DEBUG: Grid modifier bonus: {card_bonus}")
+            card_bonus = 15 * entry['value']
         
-        if effect_triggered and card_bonus > 0:
+        if card_bonus > 0:
             bonus_score += card_bonus
             effects.append({
-                'card_name': card['name'],
-                'icon': card['icon'],
+                'card_name': entry['card_name'],
+                'icon': entry['icon'],
                 'bonus': card_bonus,
-                'message': f"{card['name']}: +{card_bonus} points!"
+                'message': f"{entry['card_name']}: +{card_bonus} points!"
             })
     
-    print(f"DEBUG: Final score: {base_score} + {bonus_score} = {base_score + bonus_score}")
+    # Guarded so the INFO-level hot path never builds a log record
+    if scoring_log.isEnabledFor(logging.DEBUG):
+        scoring_log.debug('word scored', extra={
+            'word': word,
+            'base': base_score,
+            'bonus': bonus_score,
+            'effects': [effect['card_name'] for effect in effects]
+        })
     return base_score + bonus_score, effects
 
+# BOARD SOLVER
+SOLUTION_CACHE_SIZE = 512
+_solution_cache = OrderedDict()
+_solution_cache_lock = threading.Lock()
+
+def grid_key(grid):
+    return tuple(''.join(row) for row in grid)
+
+def compute_board_solution(grid):
+    """Solve grid and score every word it holds (uncached)"""
+    cols = len(grid[0])
+    words = {}
+    for word, path in solve_grid(grid, LEXICON, MIN_WORD_LENGTH).items():
+        score, _ = calculate_word_score(word, {}, {}, {})
+        words[word] = {
+            'path': [[index // cols, index % cols] for index in path],
+            'score': score
+        }
+    return {
+        'words': words,
+        'letter_mask': letter_mask(''.join(grid_key(grid))),
+        'word_count': len(words),
+        'max_score': sum(entry['score'] for entry in words.values())
+    }
+
+def cache_board_solution(grid, solution):
+    """Remember a solution computed elsewhere (e.g. by the grid pool)"""
+    key = grid_key(grid)
+    with _solution_cache_lock:
+        _solution_cache[key] = solution
+        _solution_cache.move_to_end(key)
+        while len(_solution_cache) > SOLUTION_CACHE_SIZE:
+            _solution_cache.popitem(last=False)
+
+def solve_board(grid):
+    """Return every findable word on grid with its path and base score.
+
+    Results are cached per grid and shared between requests, so treat them as read-only.
+    """
+    key = grid_key(grid)
+    with _solution_cache_lock:
+        solution = _solution_cache.get(key)
+        if solution is not None:
+            _solution_cache.move_to_end(key)
+            return solution
+    solution = compute_board_solution(grid)
+    cache_board_solution(grid, solution)
+    return solution
+
+GRID_POOL = GridPool(
+    generate_quality_grid,
+    range(len(GRID_QUALITY_TIERS)),
+    capacity=int(os.environ.get('GRID_POOL_SIZE', 8)),
+    processes=int(os.environ.get('GRID_POOL_PROCESSES', 1))
+)
+
+def deal_grid(game_state):
+    """Give game_state a fresh vetted grid plus the solver stats for it"""
+    grid, solution = GRID_POOL.pop(grid_tier(game_state['goal_score']))
+    cache_board_solution(grid, solution)
+    game_state['grid'] = grid
+    game_state['possible_words'] = solution['word_count']
+    game_state['max_possible_score'] = solution['max_score']
+
+# ROUND CLOCK
+TIME_FREEZE_SECONDS = 10
+ROUND_GRACE_SECONDS = 1.5  # Network slack for words sent right at the buzzer
+
+def start_round_clock(game_state, seconds):
+    game_state['time_remaining'] = seconds
+    game_state['round_ends_at'] = time.time() + seconds
+    game_state['time_freeze_used'] = False
+
+def round_time_left(game_state):
+    """Seconds left in the current round (0 once it has run out)"""
+    ends_at = game_state.get('round_ends_at')
+    if ends_at is None:
+        return float(game_state['time_remaining'])
+    return max(0.0, ends_at - time.time())
+
+def expire_round(game_state):
+    """End the round if its time (plus grace) is up; return True if it ended now"""
+    ends_at = game_state.get('round_ends_at')
+    if game_state['game_phase'] != 'playing' or ends_at is None:
+        return False
+    if time.time() < ends_at + ROUND_GRACE_SECONDS:
+        return False
+    # Reaching the goal already moved the round to the shop, so running out means losing
+    game_state['game_phase'] = 'game_over'
+    game_state['time_remaining'] = 0
+    game_state['round_ends_at'] = None
+    touch_state(game_state, 'game_phase', 'time_remaining')
+    record_event('game_over', game_state, score=game_state['score'], deck=list(game_state['power_deck']))
+    return True
+
+def freeze_round_clock(game_state):
+    """Apply Time Freeze: the owned power card once per round, else a one-use effect card.
+
+    Returns (success, message).
+    """
+    # A round that already ran out can't be brought back
+    if expire_round(game_state):
+        return False, "Time's up!"
+    if game_state['game_phase'] != 'playing' or game_state.get('round_ends_at') is None:
+        return False, 'No round in progress'
+    if 'time_freeze' in game_state['power_deck'] and not game_state['time_freeze_used']:
+        seconds = CARD_REGISTRY['time_freeze']['value']
+        game_state['time_freeze_used'] = True
+    elif 'time_freeze' in game_state['effect_cards']:
+        seconds = TIME_FREEZE_SECONDS
+        game_state['effect_cards'].remove('time_freeze')
+    else:
+        return False, 'No Time Freeze available'
+    game_state['round_ends_at'] += seconds
+    touch_state(game_state, 'time_remaining', 'time_freeze_used', 'effect_cards')
+    return True, f"Time frozen! +{seconds} seconds"
+
+# HINT CARDS
+HINTS = HintEngine(LEXICON, solve_board, lambda word: calculate_word_score(word, {}, {}, {})[0], MIN_WORD_LENGTH)
+
+def use_hint_card(game_state, card_id):
+    """Play Word Highlight or Combo Letters from the player's effect cards.
+
+    Returns (success, message, extra response fields).
+    """
+    if expire_round(game_state):
+        return False, "Time's up!", {}
+    if game_state['game_phase'] != 'playing':
+        return False, 'No round in progress', {}
+    if card_id not in game_state['effect_cards']:
+        return False, "You don't have that card", {}
+    
+    if card_id == 'word_highlight':
+        highlighted = game_state.setdefault('highlighted_words', [])
+        hint = HINTS.highlight(game_state['grid'], game_state['found_word_masks'], highlighted)
+        if hint is None:
+            return False, 'No 5+ letter words left to find', {}
+        word, path = hint
+        highlighted.append(word)
+        game_state['effect_cards'].remove(card_id)
+        touch_state(game_state, 'effect_cards')
+        return True, "Word highlighted!", {'hint': {'word': word, 'path': path}}
+    
+    grid, changes = HINTS.combo_letters(game_state['grid'], game_state['found_word_masks'])
+    if not changes:
+        return False, 'No letters would help this board', {}
+    solution = solve_board(grid)
+    game_state['grid'] = grid
+    game_state['possible_words'] = solution['word_count']
+    game_state['max_possible_score'] = solution['max_score']
+    game_state['effect_cards'].remove(card_id)
+    touch_state(game_state, 'grid', 'possible_words', 'max_possible_score', 'effect_cards')
+    letters = ', '.join(change['letter'] for change in changes)
+    return True, f"Added {letters} to the board!", {'changes': changes}
+
+def resolve_shop_item(item):
+    """Look up the registry entry for an item the client asked to buy.
+
+    Only the item's ID and kind are trusted; price and effects come from the registry.
+    """
+    if item.get('type') == 'effect':
+        return EFFECT_CARD_REGISTRY.get(item.get('id'))
+    if item.get('id') in PACK_REGISTRY:
+        return PACK_REGISTRY[item['id']]
+    return CARD_REGISTRY.get(item.get('id'))
+
+def apply_purchase(game_state, item):
+    """Buy item into game_state; return (success, message)"""
+    entry = resolve_shop_item(item)
+    if entry is None:
+        return False, 'Unknown item!'
+    if entry.get('is_upgrade') and entry['parent_id'] not in game_state['power_deck']:
+        return False, 'You need the base card first!'
+    if game_state['coins'] < entry['cost']:
+        return False, 'Not enough coins!'
+    
+    game_state['coins'] -= entry['cost']
+    
+    if entry.get('is_upgrade'):
+        # Replace parent card with upgrade
+        game_state['power_deck'] = [
+            entry['id'] if card_id == entry['parent_id'] else card_id
+            for card_id in game_state['power_deck']
+        ]
+    elif entry.get('type') == 'effect':
+        # Add to effect cards
+        game_state['effect_cards'].append(entry['id'])
+    elif entry['id'] == 'power_pack':
+        game_state['power_deck'].extend(card['id'] for card in random.sample(POWER_CARDS, 3))
+    elif entry['id'] == 'spell_pack':
+        game_state['effect_cards'].append(random.choice(EFFECT_CARDS)['id'])
+    else:
+        # Add to power deck
+        game_state['power_deck'].append(entry['id'])
+    
+    game_state['scoring_plan'] = compile_scoring_plan(game_state['power_deck'])
+    touch_state(game_state, 'coins', 'power_deck', 'effect_cards')
+    return True, f"Purchased {entry['name']}!"
+
 @app.route('/health')
 def health_check():
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
+@app.route('/metrics')
+def metrics_endpoint():
+    return render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
 @app.route('/')
 def index():
     if 'game_state' not in session:
@@ -310,15 +797,78 @@ def index():
 def get_game_state():
     if 'game_state' not in session:
         session['game_state'] = init_game_state()
-    return jsonify(session['game_state'])
+    game_state = session['game_state']
+    since = requested_since()
+    if since is None:
+        return jsonify(client_game_state(game_state))
+    return jsonify(game_state_payload(game_state, since))
 
 @app.route('/api/start_game', methods=['POST'])
 def start_game():
-    session['game_state'] = init_game_state()
+    # Keep revisions increasing across runs so stale ?since= values still resolve
+    previous = session.get('game_state')
+    session['game_state'] = init_game_state(previous['revision'] if previous else 0)
     game_state = session['game_state']
     game_state['game_phase'] = 'challenge_select'
     session['game_state'] = game_state
-    return jsonify({'success': True, 'game_state': game_state})
+    record_event('start_game', game_state)
+    return jsonify(state_response(game_state))
+
+# RUN PROGRESSION
+# The difficulty curve and economy; simulator.py plays runs against these
+ROUND_SECONDS = 120
+GOAL_GROWTH = 1.3  # Goal multiplier per round
+ROUNDS_PER_ANTE = 3
+MAX_ANTE = 8
+ROUND_CLEAR_BONUS = 50
+
+def start_round(game_state, deal=deal_grid):
+    """Deal a board and start the clock for the next round; returns (success, message).
+
+    Only a run waiting for its next challenge can start one, so a finished
+    round can't be replayed and a lost run can't be resumed.
+    """
+    if game_state['game_phase'] not in ('menu', 'challenge_select'):
+        return False, 'No round to start'
+    game_state['game_phase'] = 'playing'
+    deal(game_state)
+    start_round_clock(game_state, ROUND_SECONDS)
+    game_state['score'] = 0
+    game_state['found_word_masks'] = {}
+    game_state['highlighted_words'] = []
+    touch_state(game_state, 'game_phase', 'grid', 'possible_words', 'max_possible_score',
+                'time_remaining', 'time_freeze_used', 'score', 'found_word_masks')
+    return True, 'Round started'
+
+def advance_round(game_state):
+    """Leave the shop: raise the goal and move to the next round, ante or victory.
+
+    Returns (success, message). The next board is dealt by start_round once a
+    challenge is picked.
+    """
+    if game_state['game_phase'] != 'shop':
+        return False, 'Clear the round first'
+    # Save letters from this round for echo effects
+    game_state['last_round_letters'] = letter_counts(game_state['grid'])
+    
+    # Advance round
+    game_state['round'] += 1
+    game_state['game_phase'] = 'challenge_select'
+    game_state['score'] = 0
+    game_state['goal_score'] = int(game_state['goal_score'] * GOAL_GROWTH)  # Increase difficulty
+    game_state['found_word_masks'] = {}
+    game_state['time_remaining'] = max(60, 120 - (game_state['round'] * 10))
+    game_state['round_ends_at'] = None
+    
+    # Check ante progression
+    if game_state['round'] > ROUNDS_PER_ANTE:
+        game_state['ante'] += 1
+        game_state['round'] = 1
+        if game_state['ante'] > MAX_ANTE:
+            game_state['game_phase'] = 'victory'
+    
+    touch_state(game_state)
+    return True, 'Next round'
 
 @app.route('/api/select_challenge', methods=['POST'])
 def select_challenge():
@@ -326,39 +876,85 @@ def select_challenge():
     challenge_type = data.get('type', 'standard')
     
     game_state = session.get('game_state', init_game_state())
-    game_state['game_phase'] = 'playing'
-    game_state['grid'] = generate_boggle_grid()
-    game_state['time_remaining'] = 120
-    game_state['found_words'] = []
+    success, message = start_round(game_state)
+    if not success:
+        return jsonify({'success': False, 'message': message})
     
     session['game_state'] = game_state
-    return jsonify({'success': True, 'game_state': game_state})
+    # The deadline lets analytics count rounds nobody submitted to after time ran out as lost
+    record_event('select_challenge', game_state, challenge=challenge_type,
+                 goal=game_state['goal_score'], deck=list(game_state['power_deck']),
+                 ends_at=game_state['round_ends_at'])
+    return jsonify(state_response(game_state))
 
-@app.route('/api/submit_word', methods=['POST'])
-def submit_word():
-    data = request.json
-    word = data['word'].upper()
+def check_word(game_state, word):
+    """Returns (rejection message or None, path, validation) for a word on this board"""
+    # Every findable word is precomputed for the grid, so most checks are one lookup
+    solution = solve_board(game_state['grid'])
+    solved = solution['words'].get(word)
+    if solved is not None:
+        return None, solved['path'], {'valid': True, 'definition': 'Valid word', 'phonetic': ''}
     
-    game_state = session.get('game_state', init_game_state())
+    # Word must be traceable on the board before we spend time on the dictionary
+    if letter_mask(word) & ~solution['letter_mask']:
+        return 'Word not on the board', None, None
+    path = find_word_path(game_state['grid'], word)
+    if path is None:
+        return 'Word not on the board', None, None
     
     # Validate word using API
     validation = validate_word_api(word)
     if not validation['valid']:
-        return jsonify({'success': False, 'message': 'Invalid word'})
+        return 'Invalid word', None, None
+    return None, path, validation
+
+def submit_word_to_state(game_state, word):
+    """Validate and score one word against game_state, updating it in place.
+
+    Returns the per-word result dict sent back to the client.
+    """
+    # Letters only: anything else can't be on the board (and would break the letter masks)
+    normalized = normalize_word(word)
+    if normalized is None:
+        return {'success': False, 'word': word, 'message': 'Invalid word'}
+    word = normalized
     
-    if word in game_state['found_words']:
-        return jsonify({'success': False, 'message': 'Word already found!'})
+    # The server's clock decides when the round ends, whatever the client's timer says
+    if expire_round(game_state):
+        return {'success': False, 'word': word, 'message': "Time's up!", 'round_over': True}
+    if game_state['game_phase'] == 'game_over':
+        return {'success': False, 'word': word, 'message': 'Game over'}
+    if game_state['game_phase'] != 'playing':
+        # Words only count while the round's clock is running
+        return {'success': False, 'word': word, 'message': 'No round in progress'}
+    
+    with stage('word_validation'):
+        rejection, path, validation = check_word(game_state, word)
+    if rejection is not None:
+        return {'success': False, 'word': word, 'message': rejection}
+    
+    if word in game_state['found_word_masks']:
+        return {'success': False, 'word': word, 'message': 'Word already found!'}
     
     # Calculate score with power card effects
-    score, effects = calculate_word_score(
-        word, 
-        game_state['power_deck'], 
-        game_state['found_words'],
-        game_state['last_round_letters']
-    )
+    with stage('word_scoring'):
+        score, effects = calculate_word_score(
+            word, 
+            game_state['scoring_plan'], 
+            game_state['found_word_masks'],
+            game_state['last_round_letters']
+        )
+    
+    # (effect type, bonus) pairs: all the metrics and the event log need from the effects
+    effect_bonuses = []
+    if effects:
+        effect_types = {entry['card_name']: effect_type for effect_type, entry in game_state['scoring_plan'].items()}
+        effect_bonuses = [[effect_types[effect['card_name']], effect['bonus']] for effect in effects]
+        # Counted here, once per word, to keep the scorer itself lock-free
+        EFFECT_BONUSES.inc_each((effect_type,) for effect_type, _ in effect_bonuses)
     
     # Update game state  
-    game_state['found_words'].append(word)
+    game_state['found_word_masks'][word] = letter_mask(word)
     game_state['score'] += score
     # Remove words_remaining - only score matters
     game_state['run_stats']['total_words'] += 1
@@ -367,25 +963,29 @@ def submit_word():
     # Check round completion - ONLY based on score, not word count
     round_complete = game_state['score'] >= game_state['goal_score']
     
-    print(f"DEBUG: Score={game_state['score']}, Goal={game_state['goal_score']}, Round complete={round_complete}")
-    
-    if round_complete:
+    # Only the word that crosses the goal ends the round (and pays the bonus)
+    cleared_now = round_complete and game_state['game_phase'] == 'playing'
+    if cleared_now:
         if game_state['score'] >= game_state['goal_score']:
             # Success - go to shop
-            print(f"DEBUG: SUCCESS! Going to shop. Score {game_state['score']} >= Goal {game_state['goal_score']}")
+            log.debug('round cleared', extra={'score': game_state['score'], 'goal': game_state['goal_score']})
             game_state['game_phase'] = 'shop'
-            game_state['coins'] += 50  # Round completion bonus
+            game_state['coins'] += ROUND_CLEAR_BONUS
             game_state['run_stats']['rounds_completed'] += 1
         else:
             # Failed to reach goal - game over
-            print(f"DEBUG: FAILURE! Going to game over. Score {game_state['score']} < Goal {game_state['goal_score']}")
+            log.debug('round failed', extra={'score': game_state['score'], 'goal': game_state['goal_score']})
             game_state['game_phase'] = 'game_over'
     
-    session['game_state'] = game_state
+    touch_state(game_state, 'found_word_masks', 'score', 'run_stats', 'game_phase', 'coins')
+    record_event('submit_word', game_state, word=word, score=score, effects=effect_bonuses,
+                 total=game_state['score'], cleared=cleared_now)
     
-    return jsonify({
+    return {
         'success': True,
+        'revision': game_state['revision'],
         'word': word,
+        'path': path,
         'score': score,
         'total_score': game_state['score'],
         'effects': effects,
@@ -393,156 +993,335 @@ def submit_word():
 
         'definition': validation.get('definition', ''),
         'message': f"Found '{word}'! +{score} points"
+    }
+
+@app.route('/api/submit_word', methods=['POST'])
+def submit_word():
+    data = request.json
+    word = data['word'].upper()
+    
+    game_state = session.get('game_state', init_game_state())
+    
+    result = submit_word_to_state(game_state, word)
+    if not result['success']:
+        if result.get('round_over'):
+            session['game_state'] = game_state
+        return jsonify({'success': False, 'message': result['message'], 'round_over': result.get('round_over', False)})
+    
+    session['game_state'] = game_state
+    
+    return jsonify(result)
+
+MAX_BATCH_WORDS = 100
+
+@app.route('/api/submit_words', methods=['POST'])
+def submit_words():
+    """Validate and score every word found since the last sync in one round trip"""
+    data = request.json
+    words = data.get('words')
+    if not isinstance(words, list):
+        return jsonify({'success': False, 'message': 'Expected a list of words'}), 400
+    if len(words) > MAX_BATCH_WORDS:
+        return jsonify({'success': False, 'message': f'At most {MAX_BATCH_WORDS} words per batch'}), 400
+    
+    game_state = session.get('game_state', init_game_state())
+    
+    results = []
+    seen = set()
+    for raw_word in words:
+        word = str(raw_word).upper()
+        if word in seen:
+            # Duplicates inside one batch are dropped silently; the first one is scored
+            continue
+        seen.add(word)
+        results.append(submit_word_to_state(game_state, word))
+    
+    session['game_state'] = game_state
+    
+    return jsonify({
+        'success': True,
+        'results': results,
+        'words_scored': sum(1 for result in results if result['success']),
+        'total_score': game_state['score'],
+        'round_complete': game_state['score'] >= game_state['goal_score'],
+        'revision': game_state['revision'],
+        'game_phase': game_state['game_phase'],
+        'coins': game_state['coins']
     })
 
+@app.route('/api/shop_catalog')
+def get_shop_catalog():
+    """Static shop contents; clients revalidate with the ETag and usually get a 304"""
+    return SHOP_CATALOG.make_response(request, app.response_class)
+
 @app.route('/api/shop_items')
 def get_shop_items():
-    """Generate shop items for current round"""
+    """Per-player shop offer for the current round"""
     game_state = session.get('game_state', init_game_state())
     
-    # Generate 4-6 random cards
-    available_cards = random.sample(POWER_CARDS, min(5, len(POWER_CARDS)))
+    # Same offer for the same run and round, however often the shop is reloaded
+    offer = shop_offer(game_state['run_seed'], game_state['ante'], game_state['round'])
+    available_cards = expand_cards(offer, CARD_REGISTRY)
     
     # Add upgrade options for owned cards
     upgrades = []
-    for owned_card in game_state['power_deck']:
-        if 'upgrades' in owned_card:
-            for upgrade in owned_card['upgrades']:
-                upgrades.append({
-                    **upgrade,
-                    'is_upgrade': True,
-                    'parent_id': owned_card['id']
-                })
+    for card_id in game_state['power_deck']:
+        for upgrade in CARD_REGISTRY[card_id].get('upgrades', []):
+            upgrades.append(CARD_REGISTRY[upgrade['id']])
     
-    return jsonify({
+    items = {
         'cards': available_cards,
         'upgrades': upgrades[:2],  # Limit upgrades shown
-        'packs': [
-            {
-                'id': 'power_pack',
-                'name': 'Power Pack',
-                'description': '3 random Power Cards',
-                'icon': '📦',
-                'cost': 100
-            },
-            {
-                'id': 'spell_pack', 
-                'name': 'Spell Pack',
-                'description': '1-use grid modifiers',
-                'icon': '✨',
-                'cost': 80
-            }
-        ],
-        'effect_cards': [
-            {
-                'id': 'time_freeze',
-                'name': 'Time Freeze',
-                'description': 'Pause timer for 10 seconds',
-                'icon': '⏸️',
-                'cost': 30,
-                'type': 'effect'
-            },
-            {
-                'id': 'shuffle_board',
-                'name': 'Shuffle Board',
-                'description': 'Randomize all letters',
-                'icon': '🔀',
-                'cost': 25,
-                'type': 'effect'
-            },
-            {
-                'id': 'combo_letters',
-                'name': 'Combo Letters',
-                'description': 'Add 3 high-value letters',
-                'icon': '💎',
-                'cost': 40,
-                'type': 'effect'
-            },
-            {
-                'id': 'word_highlight',
-                'name': 'Word Highlight',
-                'description': 'Highlight a valid 5+ letter word',
-                'icon': '💡',
-                'cost': 35,
-                'type': 'effect'
-            },
-            {
-                'id': 'double_points',
-                'name': 'Double Points',
-                'description': 'Next word scores double points',
-                'icon': '⚡',
-                'cost': 45,
-                'type': 'effect'
-            }
-        ]
-    })
+        'catalog_etag': SHOP_CATALOG.etag
+    }
+    # Clients that fetch /api/shop_catalog ask for the offer alone
+    if not request.args.get('offer_only', type=int):
+        items['packs'] = PACKS
+        items['effect_cards'] = EFFECT_CARDS
+    return jsonify(items)
 
 @app.route('/api/purchase_item', methods=['POST'])
 def purchase_item():
     data = request.json
-    item = data['item']
     
     game_state = session.get('game_state', init_game_state())
+    success, message = apply_purchase(game_state, data['item'])
+    if not success:
+        return jsonify({'success': False, 'message': message})
     
-    if game_state['coins'] >= item['cost']:
-        game_state['coins'] -= item['cost']
-        
-        if item.get('is_upgrade'):
-            # Replace parent card with upgrade
-            game_state['power_deck'] = [
-                item if card['id'] == item['parent_id'] else card
-                for card in game_state['power_deck']
-            ]
-        elif item.get('type') == 'effect':
-            # Add to effect cards
-            game_state['effect_cards'].append(item)
-        else:
-            # Add to power deck
-            game_state['power_deck'].append(item)
-        
-        session['game_state'] = game_state
-        
-        return jsonify({
-            'success': True,
-            'coins': game_state['coins'],
-            'message': f"Purchased {item['name']}!"
-        })
+    session['game_state'] = game_state
+    record_event('purchase_item', game_state, item=data['item'].get('id'), coins=game_state['coins'],
+                 deck=list(game_state['power_deck']))
+    
+    return jsonify({
+        'success': True,
+        'revision': game_state['revision'],
+        'coins': game_state['coins'],
+        'message': message
+    })
+
+@app.route('/api/use_effect', methods=['POST'])
+def use_effect():
+    data = request.json
+    
+    game_state = session.get('game_state', init_game_state())
+    card_id = data.get('card_id')
+    if card_id == 'time_freeze':
+        success, message = freeze_round_clock(game_state)
+        extra = {}
+    elif card_id in ('word_highlight', 'combo_letters'):
+        success, message, extra = use_hint_card(game_state, card_id)
     else:
-        return jsonify({'success': False, 'message': 'Not enough coins!'})
+        return jsonify({'success': False, 'message': 'That card cannot be used yet'})
+    if not success:
+        round_over = game_state['game_phase'] == 'game_over'
+        if round_over:
+            session['game_state'] = game_state
+        return jsonify({'success': False, 'message': message, 'round_over': round_over})
+    
+    session['game_state'] = game_state
+    
+    return jsonify({
+        'success': True,
+        'revision': game_state['revision'],
+        'time_remaining': math.ceil(round_time_left(game_state)),
+        'message': message,
+        **extra
+    })
 
 @app.route('/api/continue_to_next_round', methods=['POST'])
 def continue_to_next_round():
     game_state = session.get('game_state', init_game_state())
+    if game_state['game_phase'] != 'shop':
+        return jsonify({'success': False, 'message': 'Clear the round first'})
+    # Logged before advancing, with the finished round's ante, round and score
+    record_event('continue_to_next_round', game_state, score=game_state['score'],
+                 coins=game_state['coins'], deck=list(game_state['power_deck']))
     
-    # Save letters from this round for echo effects
-    game_state['last_round_letters'] = [letter for row in game_state['grid'] for letter in row]
+    advance_round(game_state)
     
-    # Advance round
-    game_state['round'] += 1
-    game_state['game_phase'] = 'challenge_select'
-    game_state['score'] = 0
-    game_state['goal_score'] = int(game_state['goal_score'] * 1.3)  # Increase difficulty
-    game_state['grid'] = generate_boggle_grid()
-    game_state['found_words'] = []
-    game_state['time_remaining'] = max(60, 120 - (game_state['round'] * 10))
+    session['game_state'] = game_state
+    return jsonify(state_response(game_state))
+
+# MULTIPLAYER ROOMS
+ROOM_GRID_TIER = 2  # Richest 5x5 boards: more words to race for
+MAX_PLAYER_NAME = 20
+
+def deal_room_grid():
+    grid, solution = GRID_POOL.pop(ROOM_GRID_TIER)
+    cache_board_solution(grid, solution)
+    return grid
+
+ROOMS = RoomEngine(create_room_bus(app), deal_room_grid, solve_board)
+
+def room_or_404(room_id):
+    room = ROOMS.get(room_id)
+    if room is None:
+        return None, (jsonify({'success': False, 'message': 'Room not found'}), 404)
+    return room, None
+
+@app.route('/api/rooms', methods=['POST'])
+def create_room():
+    room = ROOMS.create_room()
+    return jsonify({'success': True, **room.snapshot()})
+
+@app.route('/api/rooms/<room_id>')
+def get_room(room_id):
+    """Room state; pass ?since=<seq> to get only the events after it"""
+    room, error = room_or_404(room_id)
+    if error:
+        return error
+    return jsonify(room.snapshot(request.args.get('since', type=int)))
+
+@app.route('/api/rooms/<room_id>/join', methods=['POST'])
+def join_room(room_id):
+    room, error = room_or_404(room_id)
+    if error:
+        return error
+    name = str((request.json or {}).get('name', '')).strip()[:MAX_PLAYER_NAME]
+    if not name:
+        return jsonify({'success': False, 'message': 'Pick a name'}), 400
     
-    # Check ante progression
-    if game_state['round'] > 3:
-        game_state['ante'] += 1
-        game_state['round'] = 1
-        if game_state['ante'] > 8:
-            game_state['game_phase'] = 'victory'
+    joined = session.get('rooms', {})
+    if joined.get(room_id) != name:
+        if name in room.players:
+            return jsonify({'success': False, 'message': 'That name is taken in this room'})
+        ROOMS.join(room, name)
+        session['rooms'] = {**joined, room_id: name}
     
-    session['game_state'] = game_state
-    return jsonify({'success': True, 'game_state': game_state})
+    return jsonify({'success': True, 'player': name, **room.snapshot()})
+
+@app.route('/api/rooms/<room_id>/submit_word', methods=['POST'])
+def submit_room_word(room_id):
+    room, error = room_or_404(room_id)
+    if error:
+        return error
+    player = session.get('rooms', {}).get(room_id)
+    if player is None:
+        return jsonify({'success': False, 'message': 'Join the room first'})
+    
+    word = str(request.json['word']).upper()
+    success, message, score = ROOMS.submit(room, player, word, grace=ROUND_GRACE_SECONDS)
+    return jsonify({
+        'success': success,
+        'message': message,
+        'word': word,
+        'score': score,
+        'path': room.words[word]['path'] if success else None,
+        'total_score': room.players.get(player, 0),
+        'seq': room.seq
+    })
+
+# DAILY CHALLENGE
+DAILY_GRID_TIER = 2  # Richest 5x5 boards
+DAILY_ROUND_SECONDS = 120
+LEADERBOARD = create_leaderboard(app)
+
+def today():
+    return datetime.now(timezone.utc).date().isoformat()
+
+@lru_cache(maxsize=4)
+def daily_board(day):
+    """The day's grid, the same for every player and every worker.
+
+    Seeded from the date, solved and scored once per process, then served
+    from memory; the solution also goes into the shared solver cache.
+    """
+    grid, solution = generate_quality_grid(DAILY_GRID_TIER, random.Random(f'daily:{day}'))
+    cache_board_solution(grid, solution)
+    return grid, solution
+
+def daily_state():
+    """This session's attempt at today's challenge, started on first access"""
+    day = today()
+    daily = session.get('daily')
+    if daily is None or daily['day'] != day:
+        daily = {
+            'day': day,
+            'player_id': daily['player_id'] if daily else secrets.token_urlsafe(12),
+            'ends_at': time.time() + DAILY_ROUND_SECONDS,
+            'found_words': {},  # word -> score, in the order found
+            'score': 0,
+            'finished': False
+        }
+    return daily
+
+def daily_response(daily):
+    grid, solution = daily_board(daily['day'])
+    return {
+        'day': daily['day'],
+        'grid': grid,
+        'possible_words': solution['word_count'],
+        'max_possible_score': solution['max_score'],
+        'time_remaining': math.ceil(max(0.0, daily['ends_at'] - time.time())),
+        'found_words': list(daily['found_words']),
+        'score': daily['score'],
+        'finished': daily['finished']
+    }
+
+@app.route('/api/daily')
+def get_daily():
+    daily = daily_state()
+    session['daily'] = daily
+    return jsonify(daily_response(daily))
+
+@app.route('/api/daily/submit_word', methods=['POST'])
+def submit_daily_word():
+    daily = daily_state()
+    word = str(request.json['word']).upper()
+    if daily['finished'] or time.time() > daily['ends_at'] + ROUND_GRACE_SECONDS:
+        return jsonify({'success': False, 'message': "Time's up!"})
+    
+    _, solution = daily_board(daily['day'])
+    solved = solution['words'].get(word)
+    if solved is None:
+        return jsonify({'success': False, 'message': 'Word not on the board'})
+    if word in daily['found_words']:
+        return jsonify({'success': False, 'message': 'Word already found!'})
+    
+    daily['found_words'][word] = solved['score']
+    daily['score'] += solved['score']
+    session['daily'] = daily
+    
+    return jsonify({
+        'success': True,
+        'word': word,
+        'path': solved['path'],
+        'score': solved['score'],
+        'total_score': daily['score'],
+        'message': f"Found '{word}'! +{solved['score']} points"
+    })
+
+@app.route('/api/daily/finish', methods=['POST'])
+def finish_daily():
+    """Post today's score to the leaderboard (once per player per day)"""
+    daily = daily_state()
+    name = str((request.json or {}).get('name', '')).strip()[:MAX_PLAYER_NAME] or 'Anonymous'
+    if not daily['finished']:
+        daily['finished'] = True
+        session['daily'] = daily
+        LEADERBOARD.record(daily['day'], daily['player_id'], name, daily['score'], len(daily['found_words']))
+    
+    return jsonify({'success': True, **(LEADERBOARD.rank(daily['day'], daily['player_id']) or {})})
+
+@app.route('/api/daily/leaderboard')
+def daily_leaderboard():
+    day = today()
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    board = {'day': day, 'top': LEADERBOARD.top(day, limit)}
+    daily = session.get('daily')
+    if daily and daily['day'] == day and daily['finished']:
+        board['you'] = LEADERBOARD.rank(day, daily['player_id'])
+    return jsonify(board)
 
 @app.route('/api/reset_game', methods=['POST'])
 def reset_game():
-    session['game_state'] = init_game_state()
+    previous = session.get('game_state')
+    session['game_state'] = init_game_state(previous['revision'] if previous else 0)
     return jsonify({'success': True})
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     debug = os.environ.get('FLASK_ENV') != 'production'
-    print(f"Starting Flask app on port {port}, debug={debug}")
+    log.info('starting Flask app', extra={'port': port, 'debug': debug})
     app.run(debug=debug, host='0.0.0.0', port=port) 
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Benchmark daily leaderboard writes, top-K and rank queries at scale.
+
+Fills one day with --players results (batched like the app does), then times
+top-10 and rank lookups for random players and prints the query plans, which
+should only search indexes, never scan the scores table.
+
+Usage:
+    python benchmarks/bench_leaderboard.py --players 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import Leaderboard  # noqa: E402
+
+DAY = '2000-01-01'
+
+
+def timed(call, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=500, help='results per flush')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        board = Leaderboard(os.path.join(directory, 'leaderboard.db'), flush_interval=3600)
+        started = time.perf_counter()
+        for index in range(args.players):
+            board.record(DAY, f'p{index}', f'player{index}', int(rng.gauss(2500, 900)), rng.randint(5, 60))
+            if index % args.batch == args.batch - 1:
+                board.flush()
+        board.flush()
+        elapsed = time.perf_counter() - started
+        print(f"inserted {args.players} results in {elapsed:.2f}s ({args.players / elapsed:.0f}/s)")
+
+        p50, p95 = timed(lambda: board.top(DAY, 10), args.queries)
+        print(f"top-10        p50 {p50:.3f} ms  p95 {p95:.3f} ms")
+        p50, p95 = timed(lambda: board.rank(DAY, f'p{rng.randrange(args.players)}'), args.queries)
+        print(f"rank          p50 {p50:.3f} ms  p95 {p95:.3f} ms")
+
+        conn = board._conn()
+        for label, sql, params in (
+            ('top', 'SELECT name, score, words FROM scores WHERE day = ? ORDER BY score DESC, created LIMIT 10', (DAY,)),
+            ('rank', 'SELECT COALESCE(SUM(count), 0) FROM score_counts WHERE day = ?', (DAY,)),
+        ):
+            plan = '; '.join(row[-1] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params))
+            print(f"{label:<5} plan: {plan}")
+
+
+if __name__ == '__main__':
+    main()
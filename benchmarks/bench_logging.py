@@ -0,0 +1,78 @@
+"""Micro-benchmark of per-word logging overhead in calculate_word_score.
+
+Compares the old unconditional print() debugging (stdout sent to /dev/null)
+with the structured logger at INFO (disabled) and DEBUG (queued) levels.
+
+Usage:
+    python benchmarks/bench_logging.py --words 20000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from board import letter_mask  # noqa: E402
+from log_config import flush_logging  # noqa: E402
+
+WORDS = ['CAT', 'BEAUTY', 'QUEUE', 'STONE', 'AUDIO', 'RHYTHM', 'ORANGE', 'TREES']
+DECK = ['vowel_surge', 'echo_chamber', 'anagram_amplifier', 'word_multiplier', 'wildcard']
+LAST_ROUND = {letter: 1 for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXY'}
+
+
+def score_with_prints(word, plan, found_word_masks):
+    """The pre-logging behaviour: one f-string print per step, always formatted"""
+    score, effects = app.calculate_word_score(word, plan, found_word_masks, LAST_ROUND)
+    print(f"DEBUG: Calculating score for '{word}', base={len(word) * 10}, power_deck size={len(DECK)}")
+    for effect in effects:
+        print(f"DEBUG: {effect['card_name']} bonus = {effect['bonus']}")
+    print(f"DEBUG: Final score: {len(word) * 10} + {score - len(word) * 10} = {score}")
+    return score, effects
+
+
+def per_word_us(func, plan, count):
+    found_word_masks = {'STONE': letter_mask('STONE')}
+    words = WORDS
+
+    def run():
+        for index in range(count):
+            func(words[index % len(words)], plan, found_word_masks)
+
+    return min(timeit.repeat(run, number=1, repeat=5)) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=20000, help='words scored per timing run')
+    args = parser.parse_args()
+
+    plan = app.compile_scoring_plan(DECK)
+    scoring_log = logging.getLogger('app.scoring')
+
+    def score(word, plan, found_word_masks):
+        return app.calculate_word_score(word, plan, found_word_masks, LAST_ROUND)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        # Restart the log listener so queued DEBUG records are written to /dev/null too
+        flush_logging()
+        before = per_word_us(score_with_prints, plan, args.words)
+        scoring_log.setLevel(logging.INFO)
+        info = per_word_us(score, plan, args.words)
+        scoring_log.setLevel(logging.DEBUG)
+        debug = per_word_us(score, plan, args.words)
+        flush_logging()
+    scoring_log.setLevel(logging.NOTSET)
+    flush_logging()
+
+    print(f"{'mode':<28} {'us/word':>8}")
+    print(f"{'print() debugging (before)':<28} {before:8.2f}")
+    print(f"{'logger at INFO (after)':<28} {info:8.2f}")
+    print(f"{'logger at DEBUG, queued':<28} {debug:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark full-board solve times for 5x5 through 8x8 grids.
+
+Usage:
+    WORDLIST_PATH=/path/to/words.txt python benchmarks/bench_solver.py --boards 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import solve_grid  # noqa: E402
+from lexicon import load_lexicon  # noqa: E402
+
+LETTERS = 'EEEEAAAIIIOOOUNNRRTTLLSSDDGGBCMPFHVWYKJXQZ'
+
+
+def random_grid(size, rng):
+    return [[rng.choice(LETTERS) for _ in range(size)] for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', help='word list path (defaults to WORDLIST_PATH / data/words.txt)')
+    parser.add_argument('--boards', type=int, default=50, help='boards solved per size')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    lexicon = load_lexicon(args.words)
+    if lexicon is None:
+        sys.exit('No word list found; pass --words or set WORDLIST_PATH')
+    print(f"Loaded {len(lexicon)} words in {time.perf_counter() - started:.2f}s "
+          f"({lexicon.memory_size() / 1024:.0f} KiB index)")
+
+    rng = random.Random(args.seed)
+    print(f"{'size':>5} {'words':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for size in (5, 6, 7, 8):
+        timings = []
+        word_counts = []
+        for _ in range(args.boards):
+            grid = random_grid(size, rng)
+            started = time.perf_counter()
+            found = solve_grid(grid, lexicon)
+            timings.append((time.perf_counter() - started) * 1000)
+            word_counts.append(len(found))
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{size}x{size:<3} {statistics.mean(word_counts):7.0f} "
+              f"{statistics.median(timings):8.2f} {p95:8.2f} {timings[-1]:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark cold-start cost with and without the prebuilt lexicon artifact.
+
+For each approach (parsing the plain-text word list, or memory-mapping the
+binary artifact built by ``python lexicon.py build``) this measures, in
+fresh processes:
+
+- import time of app.py
+- time to the first scored word in-process (import + start_game +
+  select_challenge + submit_word through the Flask test client)
+- time from launching gunicorn (as in the Procfile) to its first response
+
+Usage:
+    WORDLIST_PATH=/path/to/words.txt python benchmarks/bench_startup.py --repeats 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+
+from lexicon import DEFAULT_WORDLIST_PATH, Lexicon  # noqa: E402
+
+IMPORT_SCRIPT = """
+import time
+started = time.perf_counter()
+import app
+print(time.perf_counter() - started)
+"""
+
+FIRST_WORD_SCRIPT = """
+import time
+started = time.perf_counter()
+import app
+client = app.app.test_client()
+client.post('/api/start_game')
+grid = client.post('/api/select_challenge', json={'type': 'standard'}).get_json()['game_state']['grid']
+word = next(iter(app.solve_board(grid)['words']), 'CAT')
+client.post('/api/submit_word', json={'word': word})
+print(time.perf_counter() - started)
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_script(script, env):
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def gunicorn_first_response(env, workers):
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '--preload', '--workers', str(workers),
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning'],
+        cwd=ROOT, env=env
+    )
+    try:
+        while True:
+            try:
+                requests.get(f'http://127.0.0.1:{port}/health', timeout=1)
+                return time.perf_counter() - started
+            except requests.ConnectionError:
+                if time.perf_counter() - started > 60:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', default=os.environ.get('WORDLIST_PATH', DEFAULT_WORDLIST_PATH))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    args = parser.parse_args()
+    if not os.path.exists(args.words):
+        sys.exit('No word list found; pass --words or set WORDLIST_PATH')
+
+    with tempfile.TemporaryDirectory() as directory:
+        artifact = os.path.join(directory, 'words.lex')
+        started = time.perf_counter()
+        Lexicon.from_file(args.words).save(artifact)
+        print(f"built artifact in {time.perf_counter() - started:.2f}s ({os.path.getsize(artifact) / 1024:.0f} KiB)")
+
+        base_env = {
+            **os.environ,
+            'WORDLIST_PATH': args.words,
+            'LOG_LEVEL': 'WARNING',
+            'SESSION_BACKEND': 'memory',
+            'EVENT_LOG': 'off',
+            'GRID_POOL_PROCESSES': '0'
+        }
+        approaches = {
+            'text word list': {**base_env, 'LEXICON_PATH': os.path.join(directory, 'missing.lex')},
+            'mmap artifact': {**base_env, 'LEXICON_PATH': artifact}
+        }
+
+        print(f"{'approach':<16} {'import ms':>10} {'first word ms':>14} {'gunicorn ms':>12}   (medians of {args.repeats})")
+        for name, env in approaches.items():
+            imports = [run_script(IMPORT_SCRIPT, env) for _ in range(args.repeats)]
+            first_words = [run_script(FIRST_WORD_SCRIPT, env) for _ in range(args.repeats)]
+            boots = [gunicorn_first_response(env, args.workers) for _ in range(args.repeats)]
+            print(f"{name:<16} {statistics.median(imports) * 1000:10.1f} "
+                  f"{statistics.median(first_words) * 1000:14.1f} {statistics.median(boots) * 1000:12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""Load test for the game API with simulated players.
+
+Each player runs the real flow: start_game -> select_challenge -> submit_word
+(repeated) -> shop_items -> purchase_item -> continue_to_next_round, and the
+harness reports p50/p95/p99 latency and requests per second per endpoint.
+
+Usage:
+    # In-process through Flask's test client
+    python benchmarks/load_test.py --players 50
+
+    # Against a local gunicorn started by the harness
+    python benchmarks/load_test.py --gunicorn --workers 2 --concurrency 16
+
+    # Record a baseline, then fail later runs that regress against it
+    python benchmarks/load_test.py --save-baseline benchmarks/baseline.json
+    python benchmarks/load_test.py --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+
+# Simulated players submit at machine speed; measure the game, not the rate limiter
+os.environ.setdefault('RATE_LIMIT', 'off')
+
+import app  # noqa: E402
+
+DECOY_WORDS = ['QXZ', 'ZZZZ', 'JQKV', 'XYZZY']
+
+
+class ClientTransport:
+    """Runs requests in-process through Flask's test client"""
+
+    def __init__(self):
+        self._client = app.app.test_client()
+
+    def get(self, path):
+        response = self._client.get(path)
+        return response.status_code, response.get_json()
+
+    def post(self, path, payload=None):
+        response = self._client.post(path, json=payload if payload is not None else {})
+        return response.status_code, response.get_json()
+
+
+class HTTPTransport:
+    """Runs requests over HTTP with its own cookie jar"""
+
+    def __init__(self, base_url):
+        self._base_url = base_url.rstrip('/')
+        self._session = requests.Session()
+
+    def get(self, path):
+        response = self._session.get(self._base_url + path)
+        return response.status_code, response.json()
+
+    def post(self, path, payload=None):
+        response = self._session.post(self._base_url + path, json=payload if payload is not None else {})
+        return response.status_code, response.json()
+
+
+class Recorder:
+    def __init__(self):
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def timed(self, endpoint, call, *args):
+        started = time.perf_counter()
+        status, body = call(*args)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._latencies[endpoint].append(elapsed)
+            if status >= 400:
+                self._errors[endpoint] += 1
+        return body
+
+    def summary(self, wall_time):
+        report = {}
+        for endpoint, samples in sorted(self._latencies.items()):
+            samples = sorted(samples)
+            report[endpoint] = {
+                'count': len(samples),
+                'errors': self._errors[endpoint],
+                'rps': len(samples) / wall_time,
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p95_ms': percentile(samples, 95) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000
+            }
+        total = sum(len(samples) for samples in self._latencies.values())
+        report['_total'] = {'count': total, 'rps': total / wall_time, 'wall_s': wall_time}
+        return report
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def play_session(transport, recorder, rng, words_per_round, rounds):
+    """Play one run for a simulated player"""
+    recorder.timed('start_game', transport.post, '/api/start_game')
+    for _ in range(rounds):
+        body = recorder.timed('select_challenge', transport.post, '/api/select_challenge', {'type': 'standard'})
+        if not body['success']:
+            # The last round wasn't cleared, so the run is over: start another like a player would
+            recorder.timed('start_game', transport.post, '/api/start_game')
+            body = recorder.timed('select_challenge', transport.post, '/api/select_challenge', {'type': 'standard'})
+        grid = body['game_state']['grid']
+        findable = list(app.solve_board(grid)['words'])
+        rng.shuffle(findable)
+        # Mostly real words, with the odd miss like a real player
+        attempts = findable[:words_per_round] + rng.sample(DECOY_WORDS, 1)
+        rng.shuffle(attempts)
+        for word in attempts:
+            recorder.timed('submit_word', transport.post, '/api/submit_word', {'word': word})
+        shop = recorder.timed('shop_items', transport.get, '/api/shop_items')
+        if shop.get('cards'):
+            item = min(shop['cards'], key=lambda card: card['cost'])
+            recorder.timed('purchase_item', transport.post, '/api/purchase_item', {'item': item})
+        recorder.timed('continue_to_next_round', transport.post, '/api/continue_to_next_round')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(workers):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '--preload', '--workers', str(workers),
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning'],
+        cwd=ROOT,
+        env={**os.environ, 'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING')}
+    )
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            requests.get(url + '/health', timeout=1)
+            return process, url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start')
+
+
+def compare(report, baseline, tolerance):
+    """Return a list of regressions of report against baseline"""
+    regressions = []
+    for endpoint, base in baseline.items():
+        current = report.get(endpoint)
+        if current is None or endpoint.startswith('_'):
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            if current[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{endpoint}: {key[:3]} {current[key]:.2f}ms vs baseline {base[key]:.2f}ms")
+        if current['rps'] < base['rps'] * (1 - tolerance):
+            regressions.append(f"{endpoint}: {current['rps']:.0f} req/s vs baseline {base['rps']:.0f} req/s")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'endpoint':<24} {'count':>6} {'err':>4} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint, stats in report.items():
+        if endpoint.startswith('_'):
+            continue
+        print(f"{endpoint:<24} {stats['count']:6d} {stats['errors']:4d} {stats['rps']:9.1f} "
+              f"{stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f}")
+    total = report['_total']
+    print(f"{'total':<24} {total['count']:6d} {'':4} {total['rps']:9.1f}   in {total['wall_s']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=50, help='simulated players (one run each)')
+    parser.add_argument('--rounds', type=int, default=3, help='rounds played per run')
+    parser.add_argument('--words', type=int, default=12, help='words submitted per round')
+    parser.add_argument('--concurrency', type=int, default=1, help='players running at once')
+    parser.add_argument('--url', help='run against an already running server')
+    parser.add_argument('--gunicorn', action='store_true', help='start a local gunicorn to test against')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers with --gunicorn')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save-baseline', metavar='PATH', help='write the report as the new baseline')
+    parser.add_argument('--compare', metavar='PATH', help='exit 1 if the run regresses against a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed regression ratio for --compare')
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.gunicorn:
+        server, url = start_gunicorn(args.workers)
+    elif not url:
+        # Start from a full grid pool so the run measures steady state, not warm-up
+        app.GRID_POOL.fill()
+
+    def run_player(index):
+        transport = HTTPTransport(url) if url else ClientTransport()
+        play_session(transport, recorder, random.Random(args.seed + index), args.words, args.rounds)
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(run_player, range(args.players)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    report = recorder.summary(time.perf_counter() - started)
+
+    print(f"target: {url or 'flask test client'}, players={args.players}, concurrency={args.concurrency}")
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(report, json.load(handle), args.tolerance)
+        if regressions:
+            print('REGRESSIONS:')
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print('no regressions against baseline')
+
+
+if __name__ == '__main__':
+    main()
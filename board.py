@@ -0,0 +1,180 @@
+"""Board geometry and word tracing for Boggle-style letter grids.
+
+Cells are addressed by flat index (``row * cols + col``) and visited-cell sets
+are plain int bitmasks, so tracing a word allocates nothing per step and works
+the same for 5x5 through 8x8 boards.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(rows, cols=None):
+    """Return a tuple of neighbor index tuples for every cell of a rows x cols grid"""
+    if cols is None:
+        cols = rows
+    table = []
+    for row in range(rows):
+        for col in range(cols):
+            neighbors = []
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    if d_row == 0 and d_col == 0:
+                        continue
+                    r, c = row + d_row, col + d_col
+                    if 0 <= r < rows and 0 <= c < cols:
+                        neighbors.append(r * cols + c)
+            table.append(tuple(neighbors))
+    return tuple(table)
+
+
+def flatten_grid(grid):
+    """Return the grid letters as one uppercase string in row-major order"""
+    return ''.join(''.join(row) for row in grid).upper()
+
+
+def trace_word(cells, neighbors, word):
+    """Find a path for word over flattened cells; return cell indices or None.
+
+    Each letter must be adjacent to the previous one and no cell may be reused.
+    """
+    length = len(word)
+    if length == 0 or length > len(cells):
+        return None
+    # Cheap rejection before any search: the board must hold enough of each letter
+    for letter in set(word):
+        if word.count(letter) > cells.count(letter):
+            return None
+
+    path = [0] * length
+
+    def extend(cell, index, used):
+        path[index] = cell
+        if index + 1 == length:
+            return True
+        letter = word[index + 1]
+        for neighbor in neighbors[cell]:
+            if not (used >> neighbor) & 1 and cells[neighbor] == letter:
+                if extend(neighbor, index + 1, used | (1 << neighbor)):
+                    return True
+        return False
+
+    first = word[0]
+    start = cells.find(first)
+    while start >= 0:
+        if extend(start, 0, 1 << start):
+            return path
+        start = cells.find(first, start + 1)
+    return None
+
+
+def find_word_path(grid, word):
+    """Return the [row, col] cells spelling word on grid, or None if it can't be traced"""
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    path = trace_word(flatten_grid(grid), neighbor_table(rows, cols), word.upper())
+    if path is None:
+        return None
+    return [[index // cols, index % cols] for index in path]
+
+
+def solve_grid(grid, lexicon, min_length=3):
+    """Find every lexicon word that can be traced on grid.
+
+    Walks each path from every cell while following the lexicon's prefix
+    index, abandoning a path as soon as no word starts with it. Returns a
+    dict mapping each word to the cell indices of one path spelling it.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    cells = flatten_grid(grid)
+    neighbors = neighbor_table(rows, cols)
+    child = lexicon.child
+    is_terminal = lexicon.is_terminal
+    found = {}
+    path = []
+
+    def visit(cell, node, used, word):
+        node = child(node, cells[cell])
+        if node < 0:
+            return
+        word += cells[cell]
+        used |= 1 << cell
+        path.append(cell)
+        if len(word) >= min_length and word not in found and is_terminal(node):
+            found[word] = tuple(path)
+        for neighbor in neighbors[cell]:
+            if not (used >> neighbor) & 1:
+                visit(neighbor, node, used, word)
+        path.pop()
+
+    root = lexicon.root
+    for cell in range(len(cells)):
+        visit(cell, root, 0, '')
+    return found
+
+
+def solve_grid_wildcards(grid, lexicon, wildcards, min_length=3):
+    """Find the words each letter would make if placed in one of a few cells.
+
+    Same walk as solve_grid, except that on reaching a cell in ``wildcards``
+    every letter the lexicon allows next is tried there (one substitution
+    per path; the other wildcard cells keep their letters). Returns a dict
+    mapping (cell index, letter) to {word: path} for the words that need
+    that letter in that cell.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    cells = flatten_grid(grid)
+    neighbors = neighbor_table(rows, cols)
+    child = lexicon.child
+    children = lexicon.children
+    is_terminal = lexicon.is_terminal
+    found = {}
+    path = []
+
+    def visit(cell, node, used, word, placed):
+        options = []
+        next_node = child(node, cells[cell])
+        if next_node >= 0:
+            options.append((cells[cell], next_node, placed))
+        if placed is None and cell in wildcards:
+            options.extend(
+                (letter, letter_node, (cell, letter))
+                for letter, letter_node in children(node) if letter != cells[cell]
+            )
+        if not options:
+            return
+        used |= 1 << cell
+        path.append(cell)
+        for letter, next_node, next_placed in options:
+            next_word = word + letter
+            if next_placed is not None and len(next_word) >= min_length and is_terminal(next_node):
+                found.setdefault(next_placed, {}).setdefault(next_word, tuple(path))
+            for neighbor in neighbors[cell]:
+                if not (used >> neighbor) & 1:
+                    visit(neighbor, next_node, used, next_word, next_placed)
+        path.pop()
+
+    root = lexicon.root
+    for cell in range(len(cells)):
+        visit(cell, root, 0, '', None)
+    return found
+
+
+def letter_mask(word):
+    """Bitmask of the distinct letters A-Z in word (bit 0 is A); other characters are ignored"""
+    mask = 0
+    for letter in word.upper():
+        index = ord(letter) - 65
+        if 0 <= index < 26:
+            mask |= 1 << index
+    return mask
+
+
+def letter_counts(grid):
+    """Map each letter on grid to how many cells hold it"""
+    counts = {}
+    for row in grid:
+        for letter in row:
+            counts[letter] = counts.get(letter, 0) + 1
+    return counts
@@ -0,0 +1,215 @@
+"""Append-only binary log of game events, plus a streaming reader.
+
+Each record is a fixed header followed by a compact JSON body:
+
+    <uint32 body length> <uint8 event code> <float64 unix time> <body>
+
+Requests only append a tuple to an in-memory buffer; a background thread
+encodes the batch and writes it with a single ``os.write`` on an
+``O_APPEND`` descriptor, so several gunicorn workers can share one file
+without interleaving records. A torn record at the end of the file (from a
+crash mid-write) is ignored by the reader.
+
+The reader is a generator, and the analytics below consume it one event at
+a time, keeping state only for runs that are still in progress:
+
+    python event_log.py instance/events.log
+"""
+import atexit
+import heapq
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque, namedtuple
+
+from process_local import DaemonThread
+
+HEADER = struct.Struct('<IBd')
+
+EVENT_CODES = {
+    'start_game': 1,
+    'select_challenge': 2,
+    'submit_word': 3,
+    'purchase_item': 4,
+    'continue_to_next_round': 5,
+    'game_over': 6
+}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+Event = namedtuple('Event', 'kind ts fields')
+
+
+class EventLog:
+    """Buffered writer; ``append`` never touches the file"""
+
+    def __init__(self, path, flush_interval=0.5):
+        self._path = path
+        self._flush_interval = flush_interval
+        self._buffer = deque()
+        self._write_lock = threading.Lock()
+        self._writer = DaemonThread(self._flush_forever, 'event-log', on_start=self._drop_inherited)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        atexit.register(self.flush)
+
+    def _drop_inherited(self):
+        # A forked child inherits the parent's buffered events; those are the parent's to write
+        self._buffer = deque()
+        self._write_lock = threading.Lock()
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self._flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass  # Disk trouble shouldn't take the game down; the events are dropped
+
+    def append(self, kind, fields):
+        """Queue one event; fields must be JSON-serializable and not mutated afterwards"""
+        self._writer.ensure()
+        self._buffer.append((EVENT_CODES[kind], time.time(), fields))
+
+    def flush(self):
+        """Encode and write everything buffered so far in one write"""
+        with self._write_lock:
+            chunks = []
+            while self._buffer:
+                code, ts, fields = self._buffer.popleft()
+                body = json.dumps(fields, separators=(',', ':'), ensure_ascii=False).encode()
+                chunks.append(HEADER.pack(len(body), code, ts))
+                chunks.append(body)
+            if not chunks:
+                return
+            fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b''.join(chunks))
+            finally:
+                os.close(fd)
+
+
+def create_event_log(app):
+    """The app's event log, or None when EVENT_LOG=off"""
+    if os.environ.get('EVENT_LOG', 'on') == 'off':
+        return None
+    return EventLog(os.environ.get('EVENT_LOG_PATH', os.path.join(app.instance_path, 'events.log')))
+
+
+def read_events(path, buffer_size=1 << 20):
+    """Yield every Event in the log in file order, reading it in fixed-size chunks"""
+    with open(path, 'rb', buffering=buffer_size) as handle:
+        while True:
+            header = handle.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            length, code, ts = HEADER.unpack(header)
+            body = handle.read(length)
+            if len(body) < length:
+                return  # Torn final record
+            yield Event(EVENT_NAMES.get(code, code), ts, json.loads(body))
+
+
+# A round counts as lost once the stream is this far past its deadline with no
+# clear; covers the submission grace period and Time Freeze extensions
+ROUND_SLACK = 60
+
+Round = namedtuple('Round', 'run ante deck score won')
+
+
+def settled_rounds(events, now=None, max_open_runs=100000):
+    """Yield a Round for every round in the stream once its outcome is known.
+
+    A round is won by the word that clears it and lost by a game_over event,
+    or, since the web client never reports running out of time, by the
+    stream passing its deadline. Rounds still open at the end of the stream
+    are lost if their deadline is before ``now`` (default: the current time).
+    Only each run's current round is held in memory (at most
+    ``max_open_runs`` runs; the least recently active are dropped).
+    """
+    open_rounds = OrderedDict()  # run -> [ante, deck, score, deadline]
+    deadlines = []  # heap of (deadline, run), lazily cleaned
+
+    def settle(run, won, score=None):
+        state = open_rounds.pop(run, None)
+        if state is None:
+            return None
+        ante, deck, last_score, _ = state
+        return Round(run, ante, deck, last_score if score is None else score, won)
+
+    def lapse(until):
+        while deadlines and deadlines[0][0] < until:
+            deadline, run = heapq.heappop(deadlines)
+            state = open_rounds.get(run)
+            if state is not None and state[3] == deadline:
+                yield settle(run, False)
+
+    for event in events:
+        yield from lapse(event.ts - ROUND_SLACK)
+        fields = event.fields
+        run = fields.get('run')
+        if event.kind == 'select_challenge':
+            ends_at = fields.get('ends_at')
+            deadline = ends_at if ends_at is not None else float('inf')
+            open_rounds.pop(run, None)
+            open_rounds[run] = [fields.get('ante'), fields['deck'], 0, deadline]
+            if ends_at is not None:
+                heapq.heappush(deadlines, (deadline, run))
+            while len(open_rounds) > max_open_runs:
+                open_rounds.popitem(last=False)
+        elif event.kind == 'submit_word' and run in open_rounds:
+            open_rounds[run][2] = fields.get('total', open_rounds[run][2])
+            open_rounds.move_to_end(run)
+            if fields.get('cleared'):
+                yield settle(run, True)
+        elif event.kind == 'game_over':
+            outcome = settle(run, False, fields.get('score'))
+            if outcome is not None:
+                yield outcome
+    yield from lapse((time.time() if now is None else now) - ROUND_SLACK)
+
+
+def average_score_per_ante(events, **options):
+    """Mean final round score per ante, over rounds that were cleared or lost"""
+    totals = defaultdict(lambda: [0, 0])
+    for outcome in settled_rounds(events, **options):
+        total = totals[outcome.ante]
+        total[0] += outcome.score
+        total[1] += 1
+    return {ante: score / count for ante, (score, count) in sorted(totals.items())}
+
+
+def win_rate_by_card(events, **options):
+    """Share of rounds cleared, per power card owned at the start of the round"""
+    tallies = defaultdict(lambda: [0, 0])
+    for outcome in settled_rounds(events, **options):
+        for card in set(outcome.deck):
+            tally = tallies[card]
+            tally[0] += outcome.won
+            tally[1] += 1
+    return {card: (won / played, played) for card, (won, played) in sorted(tallies.items())}
+
+
+def main(path):
+    started = time.perf_counter()
+    counts = defaultdict(int)
+
+    def counted(events):
+        for event in events:
+            counts[event.kind] += 1
+            yield event
+
+    print('average score per ante:')
+    for ante, score in average_score_per_ante(counted(read_events(path))).items():
+        print(f"  ante {ante}: {score:.1f}")
+    print('win rate by owned card:')
+    for card, (rate, rounds) in win_rate_by_card(read_events(path)).items():
+        print(f"  {card:<20} {rate:6.1%} of {rounds} rounds")
+    print(f"{sum(counts.values())} events ({dict(counts)}) in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else os.path.join('instance', 'events.log'))
@@ -0,0 +1,89 @@
+"""Bounded per-difficulty pools of pre-generated grids.
+
+Vetting a grid (solving it and checking its score potential) is too slow for
+the request path, so a daemon thread keeps a few ready grids per difficulty
+tier and requests just pop one. The CPU-heavy generation runs in a forked
+worker process so it doesn't hold the GIL while requests are being served;
+the thread only waits on it. If a tier runs dry the grid is generated
+inline, so the pool is an optimisation and never a point of failure.
+"""
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from process_local import DaemonThread
+
+
+class GridPool:
+    """Keeps up to ``capacity`` grids per tier, refilled in the background.
+
+    ``make_grid(tier)`` must be a picklable module-level function returning a
+    new item for that tier. With ``processes=0`` it runs in the refill thread.
+    """
+
+    def __init__(self, make_grid, tiers, capacity=8, processes=1):
+        self._make_grid = make_grid
+        self._queues = {tier: deque(maxlen=capacity) for tier in tiers}
+        self._capacity = capacity
+        self._processes = processes
+        self._executor = None
+        self._wakeup = threading.Event()
+        # Threads don't survive fork, so each gunicorn worker starts its own
+        self._refiller = DaemonThread(self._refill_forever, 'grid-pool', on_start=self._drop_inherited)
+
+    def _drop_inherited(self):
+        # An executor inherited through fork belongs to the parent
+        self._executor = None
+
+    def _generate(self, tier):
+        if not self._processes:
+            return self._make_grid(tier)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._processes,
+                mp_context=multiprocessing.get_context('fork')
+            )
+        return self._executor.submit(self._make_grid, tier).result()
+
+    def _refill_forever(self):
+        while True:
+            tier = self._most_depleted_tier()
+            if tier is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            try:
+                self._queues[tier].append(self._generate(tier))
+            except Exception:
+                # A dead worker breaks the executor for good, so start a fresh one next time
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                # Don't spin on a broken generator; wait for the next pop to retry
+                self._wakeup.wait(timeout=5)
+                self._wakeup.clear()
+
+    def _most_depleted_tier(self):
+        tier, queue = min(self._queues.items(), key=lambda item: len(item[1]))
+        if len(queue) >= self._capacity:
+            return None
+        return tier
+
+    def pop(self, tier):
+        """Return a ready grid for tier, generating one inline if none are pooled"""
+        self._refiller.ensure()
+        self._wakeup.set()
+        try:
+            return self._queues[tier].popleft()
+        except IndexError:
+            return self._make_grid(tier)
+
+    def fill(self):
+        """Synchronously top up every tier (e.g. in the gunicorn master before forking)"""
+        for tier, queue in self._queues.items():
+            while len(queue) < self._capacity:
+                queue.append(self._make_grid(tier))
+
+    def sizes(self):
+        return {tier: len(queue) for tier, queue in self._queues.items()}
@@ -0,0 +1,150 @@
+"""Hints for the Word Highlight and Combo Letters effect cards.
+
+Both work from the board solver's cached result for the grid, so using a
+card never re-solves the board it's played on. Per grid, ``GridHints``
+caches only what never changes: the highlight candidates (5+ letter
+words, best first) and each cell's total stake, the base score of the
+words whose path crosses it. Which words a game has found or been shown
+is passed in from the game state on every call, so it doesn't matter
+which worker serves the card or how many games share the grid.
+
+Combo Letters replaces some of the lowest-stake cells (after taking out
+the words already found), where new letters cost the least. One wildcard
+walk of the lexicon finds the words every possible letter would make in
+each candidate cell, and the best (cell, letter) pairs win, up to three
+and only while a pair adds more than it takes away. Pairs are scored
+independently, so words that would need two of the new letters at once
+aren't counted. The walk is cached with the grid, so a second look at the
+same board is free.
+"""
+import threading
+from collections import OrderedDict
+
+from board import solve_grid_wildcards
+
+HIGHLIGHT_MIN_LENGTH = 5
+COMBO_LETTER_COUNT = 3
+COMBO_CANDIDATE_CELLS = 4  # Lowest-stake cells tried; each one widens the wildcard walk
+
+
+def grid_key(grid):
+    return tuple(''.join(row) for row in grid)
+
+
+class GridHints:
+    """What never changes about one grid's hints"""
+
+    def __init__(self, grid, solution):
+        self.grid = grid
+        self.cols = len(grid[0])
+        self.words = solution['words']
+        self.candidates = sorted(
+            (word for word in self.words if len(word) >= HIGHLIGHT_MIN_LENGTH),
+            key=lambda word: (-self.words[word]['score'], word)
+        )
+        stake = [0] * (len(grid) * self.cols)
+        for entry in self.words.values():
+            for row, col in entry['path']:
+                stake[row * self.cols + col] += entry['score']
+        self.stake = tuple(stake)
+        self.wildcards = {}  # candidate cells -> {(cell, letter): {word: path}}
+        self.lock = threading.Lock()
+
+    def next_highlight(self, found, highlighted):
+        """The best candidate neither found nor highlighted before, or None"""
+        for word in self.candidates:
+            if word not in found and word not in highlighted:
+                return word
+        return None
+
+    def unfound_stake(self, found):
+        """Per-cell stake left once the found words are taken out"""
+        stake = list(self.stake)
+        for word in found:
+            entry = self.words.get(word)
+            if entry is not None:
+                for row, col in entry['path']:
+                    stake[row * self.cols + col] -= entry['score']
+        return stake
+
+    def wildcard_words(self, cells, lexicon, min_length):
+        with self.lock:
+            made = self.wildcards.get(cells)
+            if made is None:
+                made = self.wildcards[cells] = solve_grid_wildcards(self.grid, lexicon, frozenset(cells), min_length)
+        return made
+
+    def best_letters(self, found, lexicon, score_word, min_length, count):
+        """Up to count (cell, letter) pairs on distinct cells, best gain in unfound score first.
+
+        Stops early rather than pick a pair that would lose more than it adds.
+        """
+        stake = self.unfound_stake(found)
+        cells = tuple(sorted(range(len(stake)), key=lambda cell: stake[cell])[:COMBO_CANDIDATE_CELLS])
+        made = self.wildcard_words(cells, lexicon, min_length)
+        
+        chosen = []
+        counted = set(self.words).union(found)
+        while len(chosen) < count:
+            taken = {cell for cell, _ in chosen}
+            best = None
+            for (cell, letter), words in made.items():
+                if cell in taken:
+                    continue
+                gain = sum(score_word(word) for word in words if word not in counted) - stake[cell]
+                if best is None or gain > best[0]:
+                    best = gain, cell, letter
+            if best is None or best[0] <= 0:
+                break
+            chosen.append(best[1:])
+            counted.update(made[best[1:]])
+        return chosen
+
+
+class HintEngine:
+    def __init__(self, lexicon, solve, score_word, min_length=3, cache_size=256):
+        self._lexicon = lexicon
+        self._solve = solve
+        self._score_word = score_word
+        self._min_length = min_length
+        self._cache_size = cache_size
+        self._grids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hints_for(self, grid):
+        key = grid_key(grid)
+        with self._lock:
+            hints = self._grids.get(key)
+            if hints is not None:
+                self._grids.move_to_end(key)
+                return hints
+        hints = GridHints([list(row) for row in grid], self._solve(grid))
+        with self._lock:
+            hints = self._grids.setdefault(key, hints)
+            self._grids.move_to_end(key)
+            while len(self._grids) > self._cache_size:
+                self._grids.popitem(last=False)
+        return hints
+
+    def highlight(self, grid, found, highlighted=()):
+        """Return (word, path) for a 5+ letter word neither found nor highlighted, or None"""
+        hints = self.hints_for(grid)
+        word = hints.next_highlight(found, highlighted)
+        if word is None:
+            return None
+        return word, hints.words[word]['path']
+
+    def combo_letters(self, grid, found, count=COMBO_LETTER_COUNT):
+        """Pick up to count letters to place that add the most unfound score.
+
+        Returns (new grid, [{'row', 'col', 'letter'}...]); grid itself is not modified.
+        """
+        hints = self.hints_for(grid)
+        chosen = hints.best_letters(found, self._lexicon, self._score_word, self._min_length, count)
+        grid = [list(row) for row in grid]
+        changes = []
+        for cell, letter in chosen:
+            row, col = divmod(cell, hints.cols)
+            grid[row][col] = letter
+            changes.append({'row': row, 'col': col, 'letter': letter})
+        return grid, changes
@@ -0,0 +1,116 @@
+"""Daily-challenge leaderboard in SQLite.
+
+Results are written behind in batches (one transaction per flush) and kept
+in two tables: ``scores`` holds one row per player per day, indexed by
+(day, score) for top-K, and ``score_counts`` is a per-day histogram of
+scores. A player's rank is one plus the number of players with a higher
+score, summed from the histogram, so it reads at most one row per distinct
+score instead of every row above the player.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+from process_local import DaemonThread, SQLiteDatabase
+
+
+class Leaderboard:
+    def __init__(self, path, flush_interval=0.2):
+        self._flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._db = SQLiteDatabase(path, (
+            'CREATE TABLE IF NOT EXISTS scores ('
+            'day TEXT NOT NULL, player_id TEXT NOT NULL, name TEXT NOT NULL, '
+            'score INTEGER NOT NULL, words INTEGER NOT NULL, created REAL NOT NULL, '
+            'PRIMARY KEY (day, player_id)) WITHOUT ROWID',
+            'CREATE INDEX IF NOT EXISTS scores_by_score ON scores (day, score DESC, created)',
+            'CREATE TABLE IF NOT EXISTS score_counts ('
+            'day TEXT NOT NULL, score INTEGER NOT NULL, count INTEGER NOT NULL, '
+            'PRIMARY KEY (day, score)) WITHOUT ROWID'
+        ))
+        self._flusher = DaemonThread(self._flush_forever, 'leaderboard-flush', on_start=self._drop_inherited)
+        atexit.register(self.flush)
+
+    def _drop_inherited(self):
+        # A forked child inherits the parent's unflushed results; those are the parent's to flush
+        self._pending = {}
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self._flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # Kept pending; retried on the next tick
+
+    def record(self, day, player_id, name, score, words):
+        """Queue a result; a player's first result for a day is the one that counts"""
+        self._flusher.ensure()
+        with self._lock:
+            self._pending.setdefault((day, player_id), (name, score, words, time.time()))
+
+    def flush(self):
+        """Write queued results in a single transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        conn = self._db.conn()
+        conn.execute('BEGIN')
+        try:
+            for (day, player_id), (name, score, words, created) in pending.items():
+                inserted = conn.execute(
+                    'INSERT OR IGNORE INTO scores (day, player_id, name, score, words, created) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (day, player_id, name, score, words, created)
+                ).rowcount
+                if inserted:
+                    conn.execute(
+                        'INSERT INTO score_counts (day, score, count) VALUES (?, ?, 1) '
+                        'ON CONFLICT(day, score) DO UPDATE SET count = count + 1',
+                        (day, score)
+                    )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending.setdefault(key, value)
+            raise
+
+    def top(self, day, limit=10):
+        rows = self._db.conn().execute(
+            'SELECT name, score, words FROM scores WHERE day = ? ORDER BY score DESC, created LIMIT ?',
+            (day, limit)
+        ).fetchall()
+        return [
+            {'rank': index + 1, 'name': name, 'score': score, 'words': words}
+            for index, (name, score, words) in enumerate(rows)
+        ]
+
+    def rank(self, day, player_id):
+        """Return {rank, score, players} for a player's result that day, or None"""
+        if (day, player_id) in self._pending:
+            # Read your own write: don't make the player wait for the next batch
+            self.flush()
+        conn = self._db.conn()
+        row = conn.execute(
+            'SELECT score FROM scores WHERE day = ? AND player_id = ?', (day, player_id)
+        ).fetchone()
+        if row is None:
+            return None
+        score = row[0]
+        better, players = conn.execute(
+            'SELECT COALESCE(SUM(CASE WHEN score > ? THEN count END), 0), COALESCE(SUM(count), 0) '
+            'FROM score_counts WHERE day = ?',
+            (score, day)
+        ).fetchone()
+        return {'rank': better + 1, 'score': score, 'players': players}
+
+
+def create_leaderboard(app):
+    path = os.environ.get('LEADERBOARD_DB_PATH', os.path.join(app.instance_path, 'leaderboard.db'))
+    return Leaderboard(path)
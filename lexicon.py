@@ -0,0 +1,281 @@
+"""Compact lexicon index for word validation and prefix search.
+
+Words are stored in a minimised DAWG (a trie with shared suffixes) that is
+flattened into a handful of flat arrays. Lookups walk one edge per letter, so
+membership and prefix queries are O(len(word)) no matter how many words are
+loaded. Because the whole index lives in a few large buffers instead of
+millions of small Python objects, loading it once in the gunicorn master
+(``--preload``) lets every forked worker share the same pages copy-on-write.
+
+Building the index from a plain-text list takes a second or more, so deploys
+compile it ahead of time into a binary artifact:
+
+    python lexicon.py build data/words.txt -o data/words.lex
+
+The artifact is the flat arrays written out as-is behind a small versioned
+header. Opening it just memory-maps the file: nothing is parsed, and pages
+are read from disk the first time a lookup touches them.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MIN_WORD_LENGTH = 3
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_WORDLIST_PATH = os.path.join(DATA_DIR, 'words.txt')
+DEFAULT_ARTIFACT_PATH = os.path.join(DATA_DIR, 'words.lex')
+
+# magic, format version, min word length, node count, edge count, root, word count
+ARTIFACT_HEADER = struct.Struct('<8sHHIIII')
+ARTIFACT_MAGIC = b'WSMLEX\0\0'
+ARTIFACT_VERSION = 1
+
+
+def normalize_word(word):
+    """Return the uppercase form of word, or None if it can't be a game word"""
+    word = word.strip().upper()
+    if not word or not word.isascii() or not word.isalpha():
+        return None
+    return word
+
+
+class Lexicon:
+    """Read-only word index backed by flat arrays.
+
+    Node ``n`` owns the edges ``first[n]:first[n + 1]``; ``labels`` holds the
+    edge letters (sorted per node) and ``targets`` the node each edge leads to.
+    """
+
+    __slots__ = ('_first', '_labels', '_targets', '_terminal', '_root', '_word_count', '_mmap')
+
+    def __init__(self, first, labels, targets, terminal, root, word_count, backing=None):
+        self._first = first
+        self._labels = labels
+        self._targets = targets
+        self._terminal = terminal
+        self._root = root
+        self._word_count = word_count
+        self._mmap = backing  # Keeps a mapped artifact open for as long as the index lives
+
+    @classmethod
+    def from_words(cls, words, min_length=MIN_WORD_LENGTH):
+        """Build a minimised index from an iterable of words"""
+        trie = [False, {}]
+        word_count = 0
+        for raw in words:
+            word = normalize_word(raw)
+            if word is None or len(word) < min_length:
+                continue
+            node = trie
+            for letter in word:
+                children = node[1]
+                child = children.get(letter)
+                if child is None:
+                    child = children[letter] = [False, {}]
+                node = child
+            if not node[0]:
+                node[0] = True
+                word_count += 1
+
+        # Merge identical subtrees bottom-up; each unique node becomes one entry
+        registry = {}
+        nodes = []
+
+        def freeze(node):
+            edges = tuple((letter, freeze(child)) for letter, child in sorted(node[1].items()))
+            key = (node[0], edges)
+            index = registry.get(key)
+            if index is None:
+                index = registry[key] = len(nodes)
+                nodes.append(key)
+            return index
+
+        root = freeze(trie)
+
+        first = array('I', [0])
+        labels = bytearray()
+        targets = array('I')
+        terminal = bytearray(len(nodes))
+        for index, (is_terminal, edges) in enumerate(nodes):
+            terminal[index] = is_terminal
+            for letter, child in edges:
+                labels.append(ord(letter))
+                targets.append(child)
+            first.append(len(targets))
+
+        return cls(first, bytes(labels), targets, bytes(terminal), root, word_count)
+
+    @classmethod
+    def from_file(cls, path, min_length=MIN_WORD_LENGTH):
+        """Build an index from a plain-text word list, one word per line"""
+        with open(path, encoding='utf-8', errors='ignore') as handle:
+            return cls.from_words(handle, min_length=min_length)
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a binary artifact written by save(); raises ValueError if it isn't one"""
+        if sys.byteorder != 'little' or array('I').itemsize != 4:
+            raise ValueError('Lexicon artifacts need a little-endian platform with 4-byte unsigned ints')
+        with open(path, 'rb') as handle:
+            backing = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(backing) < ARTIFACT_HEADER.size:
+            raise ValueError(f"{path} is not a lexicon artifact")
+        magic, version, _, node_count, edge_count, root, word_count = ARTIFACT_HEADER.unpack_from(backing)
+        if magic != ARTIFACT_MAGIC or version != ARTIFACT_VERSION:
+            raise ValueError(f"{path} is not a version {ARTIFACT_VERSION} lexicon artifact")
+        view = memoryview(backing)
+        offset = ARTIFACT_HEADER.size
+        sections = []
+        for size, int_array in ((node_count + 1, True), (edge_count, True), (edge_count, False), (node_count, False)):
+            length = size * 4 if int_array else size
+            section = view[offset:offset + length]
+            sections.append(section.cast('I') if int_array else section)
+            offset += length
+        if offset != len(backing):
+            raise ValueError(f"{path} is truncated or corrupt")
+        first, targets, labels, terminal = sections
+        # bytes.find is what makes child() fast, so the (small) label and flag
+        # sections are copied; the integer arrays stay mapped
+        return cls(first, bytes(labels), targets, bytes(terminal), root, word_count, backing)
+
+    def save(self, path, min_length=MIN_WORD_LENGTH):
+        """Write the index as a binary artifact for open()"""
+        header = ARTIFACT_HEADER.pack(
+            ARTIFACT_MAGIC, ARTIFACT_VERSION, min_length,
+            len(self._terminal), len(self._labels), self._root, self._word_count
+        )
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as handle:
+            handle.write(header)
+            handle.write(array('I', self._first).tobytes())
+            handle.write(array('I', self._targets).tobytes())
+            handle.write(self._labels)
+            handle.write(self._terminal)
+        # Workers may be mapping the old file; replace it atomically
+        os.replace(temp_path, path)
+
+    @property
+    def root(self):
+        return self._root
+
+    def __len__(self):
+        return self._word_count
+
+    def child(self, node, letter):
+        """Return the node reached from node via letter, or -1"""
+        start = self._first[node]
+        index = self._labels.find(ord(letter), start, self._first[node + 1])
+        if index < 0:
+            return -1
+        return self._targets[index]
+
+    def is_terminal(self, node):
+        return self._terminal[node] == 1
+
+    def children(self, node):
+        """Return (letter, node) for every edge out of node, in letter order"""
+        labels = self._labels
+        targets = self._targets
+        return [(chr(labels[index]), targets[index]) for index in range(self._first[node], self._first[node + 1])]
+
+    def walk(self, prefix, node=None):
+        """Follow prefix from node (default root); return the end node or -1"""
+        if node is None:
+            node = self._root
+        first = self._first
+        labels = self._labels
+        targets = self._targets
+        for letter in prefix:
+            code = ord(letter)
+            if code > 127:
+                return -1
+            index = labels.find(code, first[node], first[node + 1])
+            if index < 0:
+                return -1
+            node = targets[index]
+        return node
+
+    def __contains__(self, word):
+        node = self.walk(word.upper())
+        return node >= 0 and self._terminal[node] == 1
+
+    def has_prefix(self, prefix):
+        """True if at least one word starts with prefix"""
+        return self.walk(prefix.upper()) >= 0
+
+    def words_with_prefix(self, prefix, limit=None):
+        """Yield words starting with prefix in alphabetical order"""
+        prefix = prefix.upper()
+        node = self.walk(prefix)
+        if node < 0:
+            return
+        first = self._first
+        labels = self._labels
+        targets = self._targets
+        terminal = self._terminal
+        yielded = 0
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if terminal[node]:
+                yield word
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+            # Push in reverse so the smallest letter is explored first
+            for index in range(first[node + 1] - 1, first[node] - 1, -1):
+                stack.append((targets[index], word + chr(labels[index])))
+
+    def __iter__(self):
+        return self.words_with_prefix('')
+
+    def memory_size(self):
+        """Approximate bytes used by the index buffers"""
+        return (
+            self._first.itemsize * len(self._first)
+            + len(self._labels)
+            + self._targets.itemsize * len(self._targets)
+            + len(self._terminal)
+        )
+
+
+def load_lexicon(path=None):
+    """Load the prebuilt artifact (LEXICON_PATH or data/words.lex) if there is
+    one, else build from the word list named by WORDLIST_PATH (or data/words.txt).
+
+    Returns None when no word list is available so callers can fall back.
+    """
+    if path is None:
+        artifact = os.environ.get('LEXICON_PATH', DEFAULT_ARTIFACT_PATH)
+        if os.path.exists(artifact):
+            return Lexicon.open(artifact)
+    path = path or os.environ.get('WORDLIST_PATH', DEFAULT_WORDLIST_PATH)
+    if not os.path.exists(path):
+        return None
+    return Lexicon.from_file(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a word list into a binary lexicon artifact')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('wordlist', nargs='?', default=os.environ.get('WORDLIST_PATH', DEFAULT_WORDLIST_PATH))
+    parser.add_argument('-o', '--output', default=os.environ.get('LEXICON_PATH', DEFAULT_ARTIFACT_PATH))
+    parser.add_argument('--skip-missing', action='store_true', help='exit quietly if there is no word list')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.wordlist):
+        if args.skip_missing:
+            print(f"no word list at {args.wordlist}; skipping lexicon build")
+            return
+        sys.exit(f"no word list at {args.wordlist}")
+    lexicon = Lexicon.from_file(args.wordlist)
+    lexicon.save(args.output)
+    print(f"wrote {len(lexicon)} words to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
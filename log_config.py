@@ -0,0 +1,111 @@
+"""Logging setup: structured records, per-module levels, off-thread output.
+
+Log calls only enqueue the record; a listener thread formats it and does the
+write, so a request never blocks on stdout. Levels come from the
+environment:
+
+    LOG_LEVEL=INFO                                 # default for everything
+    LOG_LEVELS=app.scoring=DEBUG,werkzeug=WARNING  # per-logger overrides
+    LOG_FORMAT=json                                # json (default) or text
+
+Pass structured fields with ``extra``; they are emitted alongside the message.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def record_fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        entry.update(record_fields(record))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(',', ':'))
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = record_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue the record as-is; the stock handler formats it in the caller's thread"""
+
+    def prepare(self, record):
+        return record
+
+
+_queue_handler = None
+_listener = None
+
+
+def _start_listener():
+    global _listener
+    log_queue = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JSONFormatter() if os.environ.get('LOG_FORMAT', 'json') == 'json' else TextFormatter())
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # The listener thread doesn't survive fork, so each gunicorn worker starts its own
+    if _queue_handler is not None:
+        _start_listener()
+
+
+def parse_levels(spec):
+    """Parse 'name=LEVEL,name=LEVEL' into a dict"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, level = item.partition('=')
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging():
+    """Route all logging through the queue listener; safe to call more than once"""
+    global _queue_handler
+    root = logging.getLogger()
+    root.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    for name, level in parse_levels(os.environ.get('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(level)
+
+    if _queue_handler is not None:
+        return
+    _queue_handler = DeferredQueueHandler(None)
+    root.handlers[:] = [_queue_handler]
+    _start_listener()
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def flush_logging():
+    """Drain queued records (stops and restarts the listener)"""
+    if _listener is not None:
+        _listener.stop()
+        _start_listener()
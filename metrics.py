@@ -0,0 +1,327 @@
+"""In-process request metrics and an opt-in sampling profiler.
+
+Counters and histograms live in this process and are rendered in the
+Prometheus text format by ``render()``. Under gunicorn each worker has its
+own; set METRICS_DIR to a shared directory and every worker also dumps its
+totals there every few seconds, so ``/metrics`` on any worker reports the
+sum across all of them.
+
+Profiling is off unless asked for. A request carrying
+``X-Profile: <PROFILE_TOKEN>`` is profiled, and PROFILE_SAMPLE_RATE=0.01
+profiles 1% of requests. While a request is profiled, a thread samples its
+stack every PROFILE_INTERVAL seconds. The stacks are appended in the folded
+format (``frame;frame;frame count``) to PROFILE_DIR/<pid>.folded, ready for
+flamegraph.pl or speedscope. The first frame is the route.
+"""
+import bisect
+import glob
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter as CountMap
+
+from process_local import DaemonThread
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = CountMap()
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def inc_each(self, label_value_tuples):
+        """Add one to several series under a single lock acquisition"""
+        with self._lock:
+            self._values.update(label_value_tuples)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    @staticmethod
+    def merge(into, snapshot):
+        for key, value in snapshot:
+            key = tuple(key)
+            into[key] = into.get(key, 0) + value
+
+    def render(self, merged):
+        for key, value in sorted(merged.items()):
+            yield f"{self.name}{format_labels(self.labels, key)} {value}"
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self._values = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, seconds, *label_values):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def time(self, *label_values):
+        return Timer(self, label_values)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), list(series)] for key, series in self._values.items()]
+
+    @staticmethod
+    def merge(into, snapshot):
+        for key, series in snapshot:
+            key = tuple(key)
+            current = into.get(key)
+            into[key] = series if current is None else [a + b for a, b in zip(current, series)]
+
+    def render(self, merged):
+        for key, series in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                labels = format_labels(self.labels + ('le',), key + (str(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = format_labels(self.labels, key)
+            yield f"{self.name}_sum{labels} {series[-1]}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Timer:
+    """Context manager observing the elapsed time into a histogram"""
+
+    __slots__ = ('_histogram', '_labels', '_started')
+
+    def __init__(self, histogram, labels):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._started, *self._labels)
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{escape_label(value)}"'
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REGISTRY = []
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time from WSGI entry to response, by route',
+    ('method', 'route')
+)
+REQUESTS = Counter('http_requests_total', 'Requests served, by route and status', ('method', 'route', 'status'))
+STAGE_LATENCY = Histogram(
+    'request_stage_duration_seconds', 'Time spent in the main request stages',
+    ('stage',), buckets=STAGE_BUCKETS
+)
+EFFECT_BONUSES = Counter('scoring_effects_total', 'Words where a scoring effect added points', ('effect',))
+
+
+def stage(name):
+    """Time a block as one of the request stages"""
+    return STAGE_LATENCY.time(name)
+
+
+# MULTI-WORKER AGGREGATION
+METRICS_DIR = os.environ.get('METRICS_DIR')
+DUMP_INTERVAL = 5
+
+
+def snapshot():
+    return {metric.name: metric.snapshot() for metric in REGISTRY}
+
+
+def _dump_forever():
+    path = os.path.join(METRICS_DIR, f'{os.getpid()}.json')
+    while True:
+        time.sleep(DUMP_INTERVAL)
+        dump(path)
+
+
+def dump(path):
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as handle:
+        json.dump(snapshot(), handle, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+_dumper = DaemonThread(_dump_forever, 'metrics-dump', on_start=lambda: os.makedirs(METRICS_DIR, exist_ok=True))
+
+
+def ensure_dumper():
+    if METRICS_DIR is not None:
+        _dumper.ensure()
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    snapshots = [snapshot()]
+    if METRICS_DIR is not None:
+        own = os.path.join(METRICS_DIR, f'{os.getpid()}.json')
+        for path in glob.glob(os.path.join(METRICS_DIR, '*.json')):
+            if path == own:
+                continue  # Our live numbers are newer than our last dump
+            try:
+                with open(path) as handle:
+                    snapshots.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+    lines = []
+    for metric in REGISTRY:
+        merged = {}
+        for data in snapshots:
+            metric.merge(merged, data.get(metric.name, []))
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render(merged))
+    return '\n'.join(lines) + '\n'
+
+
+# SAMPLING PROFILER
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', 0.001))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+
+class SamplingProfiler:
+    """Samples one thread's stack on a timer until stopped"""
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stacks = CountMap()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self._stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        return self._stacks
+
+    @staticmethod
+    def write(stacks, root):
+        """Append stacks to this process's folded-stacks file under a root frame"""
+        if not stacks:
+            return
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        root = root.replace(';', ':').replace(' ', '_')
+        with open(os.path.join(PROFILE_DIR, f'{os.getpid()}.folded'), 'a') as handle:
+            handle.writelines(f"{root};{stack} {count}\n" for stack, count in stacks.items())
+
+
+def should_profile(environ):
+    token = environ.get('HTTP_X_PROFILE')
+    if token is not None and PROFILE_TOKEN and token == PROFILE_TOKEN:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+# FLASK WIRING
+class InstrumentedWSGI:
+    """Times every request end to end (session decode and encode included)"""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        ensure_dumper()
+        profiler = SamplingProfiler(threading.get_ident()).start() if should_profile(environ) else None
+        started = time.perf_counter()
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            elapsed = time.perf_counter() - started
+            method = environ.get('REQUEST_METHOD', '')
+            route = environ.get('metrics.route', 'unmatched')
+            REQUEST_LATENCY.observe(elapsed, method, route)
+            REQUESTS.inc(method, route, environ.get('metrics.status', '500'))
+            if profiler is not None:
+                SamplingProfiler.write(profiler.stop(), f"{method} {route}")
+
+
+class TimedSessionInterface:
+    """Wraps a session interface to time session decode and encode"""
+
+    def __init__(self, inner):
+        self._inner = inner
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    def open_session(self, app, request):
+        with STAGE_LATENCY.time('session_decode'):
+            return self._inner.open_session(app, request)
+
+    def save_session(self, app, session, response):
+        with STAGE_LATENCY.time('session_encode'):
+            return self._inner.save_session(app, session, response)
+
+
+def instrument(app):
+    """Install request timing and session stage timing on a Flask app"""
+    from flask import request, request_finished
+
+    def record_route(sender, response, **extra):
+        rule = request.url_rule
+        request.environ['metrics.route'] = rule.rule if rule is not None else 'unmatched'
+        request.environ['metrics.status'] = str(response.status_code)
+
+    # Strong reference: signal receivers are weakly held by default
+    request_finished.connect(record_route, app, weak=False)
+    app.session_interface = TimedSessionInterface(app.session_interface)
+    app.wsgi_app = InstrumentedWSGI(app.wsgi_app)
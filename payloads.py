@@ -0,0 +1,98 @@
+"""Response compression for JSON payloads.
+
+Small bodies go out as-is; anything over COMPRESS_MIN_BYTES is brotli- or
+gzip-encoded depending on the client's Accept-Encoding. Brotli is optional:
+install the ``brotli`` package to enable it. Static payloads can be encoded
+once up front with ``StaticPayload``.
+"""
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(accept_encoding):
+    """Return the set of encodings named in an Accept-Encoding header (ignoring q=0)"""
+    encodings = set()
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0'):
+            continue
+        if name:
+            encodings.add(name.lower())
+    return encodings
+
+
+def choose_encoding(accept_encoding):
+    """Best supported encoding for a request, or None"""
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and 'br' in encodings:
+        return 'br'
+    if 'gzip' in encodings:
+        return 'gzip'
+    return None
+
+
+def compress_bytes(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported encoding {encoding!r}")
+
+
+def available_encodings():
+    """Encodings this process can produce, preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress_response(response, accept_encoding):
+    """Compress a JSON response in place when it is big enough to be worth it"""
+    if (
+        response.direct_passthrough
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.mimetype != 'application/json'
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    response.set_data(compress_bytes(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+class StaticPayload:
+    """A JSON body serialized and compressed once, served with a content-hash ETag"""
+
+    def __init__(self, data):
+        self.body = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode()
+        self.etag = hashlib.sha256(self.body).hexdigest()[:20]
+        self.variants = {encoding: compress_bytes(self.body, encoding) for encoding in available_encodings()}
+
+    def make_response(self, request, response_class):
+        """Build the response for request, or a 304 if the client's copy is current"""
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        response = response_class(self.variants.get(encoding, self.body), mimetype='application/json')
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        # Weak, because the encoded variants share one tag
+        response.set_etag(self.etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
@@ -0,0 +1,74 @@
+"""Per-process resources for code that runs under gunicorn --preload.
+
+Threads and SQLite connections don't survive fork: a worker forked from a
+master that imported the app has neither the master's background threads
+nor usable copies of its connections. ``DaemonThread`` starts a background
+loop once in each process, on first use, and ``SQLiteDatabase`` hands out
+one connection per thread and per process.
+"""
+import os
+import sqlite3
+import threading
+
+
+class DaemonThread:
+    """A daemon thread running target(), started by ensure() once in each process.
+
+    on_start() runs just before the thread starts in a new process; use it to
+    drop state inherited from the parent (buffers, executors, locks).
+    """
+
+    def __init__(self, target, name, on_start=None):
+        self._target = target
+        self._name = name
+        self._on_start = on_start
+        self._pid = None
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # Another thread may have held the lock at fork time; the child's copy would never be released
+        self._lock = threading.Lock()
+
+    def ensure(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._on_start is not None:
+                self._on_start()
+            self._pid = os.getpid()
+            threading.Thread(target=self._target, name=self._name, daemon=True).start()
+
+
+class SQLiteDatabase:
+    """A WAL-mode SQLite file shared by every process, with synchronous=NORMAL"""
+
+    def __init__(self, path, schema=()):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self.connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            for statement in schema:
+                conn.execute(statement)
+        finally:
+            conn.close()
+
+    def connect(self):
+        """A new autocommit connection"""
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def conn(self):
+        """This thread's connection (and this process's: connections can't cross fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = self.connect()
+            self._local.pid = os.getpid()
+        return conn
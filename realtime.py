@@ -0,0 +1,275 @@
+"""Real-time game channel over WebSockets.
+
+Runs next to the Flask app as its own asyncio process and shares the
+server-side session store, so a player's browser cookie authenticates the
+socket and both channels see the same game state. Over the socket the client
+submits words and uses Time Freeze without an HTTP round trip per action,
+and the server pushes the round clock: it owns the deadline, so a slow or
+tampered client timer can't buy extra time.
+
+Client -> server messages (JSON):
+
+    {"type": "submit", "word": "CAT"}
+    {"type": "freeze"}
+    {"type": "sync"}
+    {"type": "watch_room", "room_id": "..."}     # after joining over HTTP
+    {"type": "room_submit", "word": "CAT"}
+
+Server -> client messages:
+
+    {"type": "result", ...}                      # same fields as /api/submit_word
+                                                 # (or rate_limited + retry_after, see admission.py)
+    {"type": "clock", "phase": ..., "time_remaining": 87.4}
+    {"type": "state", "game_state": {...}}
+    {"type": "round_over", "game_state": {...}}
+    {"type": "room", ...}                        # room snapshot on watch
+    {"type": "room_event", "room_id": ..., "event": {...}}  # every join / found word
+    {"type": "error", "message": ...}
+
+The bundled web client still plays over HTTP; this channel is server-side
+only for now. Run with ``python realtime.py`` (REALTIME_HOST / REALTIME_PORT, default
+0.0.0.0:8765). Requires a server-side SESSION_BACKEND (sqlite for more than
+one process), and ROOM_BUS=sqlite to see rooms created by the web workers.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+from http.cookies import SimpleCookie
+
+import websockets
+
+import app as game
+from admission import ADMISSION_REJECTIONS, RATE_LIMITED_MESSAGE, create_limiter
+
+log = logging.getLogger('app.realtime')
+
+MAX_MESSAGE_BYTES = 4096
+# Same per-session word budget as the HTTP submit routes (see admission.py)
+LIMITER = create_limiter()
+
+
+def session_id(websocket):
+    """Signed session ID from the handshake's Cookie header, or None"""
+    interface = game.app.session_interface
+    cookies = SimpleCookie()
+    try:
+        cookies.load(websocket.request_headers.get('Cookie', ''))
+    except Exception:
+        return None
+    morsel = cookies.get(interface.get_cookie_name(game.app))
+    return interface.sid_from_cookie(game.app, morsel.value if morsel else None)
+
+
+class GameConnection:
+    """One player's socket.
+
+    The decoded session is kept on the connection and reused for every
+    message; a store lookup of its save stamp (no decoding) tells whether the
+    web workers changed it in between. Each change is still written through,
+    so HTTP requests see it straight away.
+    """
+
+    def __init__(self, websocket, sid):
+        self.websocket = websocket
+        self.sid = sid
+        self.store = game.app.session_interface.store
+        self.clock_changed = asyncio.Event()
+        self.lock = asyncio.Lock()
+        self.room = None
+        self.room_updates = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._data = {}
+        self._stamp = None
+
+    @property
+    def game_state(self):
+        return self._data.get('game_state')
+
+    def _load(self, force=False):
+        """The session, decoded again only if it was saved elsewhere since we last saw it"""
+        stamp = self.store.stamp(self.sid)
+        if force or stamp != self._stamp:
+            self._data = self.store.get(self.sid) or {}
+            self._stamp = stamp
+        return self._data, self.game_state
+
+    def _apply(self, action):
+        """Run action(game_state) against the session and persist any change"""
+        data, game_state = self._load()
+        if game_state is None:
+            return None, None
+        revision = game_state['revision']
+        result = action(game_state)
+        if game_state['revision'] != revision:
+            self._stamp = self.store.set(self.sid, data)
+        return game_state, result
+
+    async def apply(self, action):
+        # Store reads and the scoring work are blocking, so keep them off the event loop
+        async with self.lock:
+            return await asyncio.to_thread(self._apply, action)
+
+    def rate_limited(self):
+        """Seconds until this session may submit another word (0 if it may now)"""
+        if LIMITER is None:
+            return 0
+        wait = LIMITER.take(self.sid)
+        if wait:
+            ADMISSION_REJECTIONS.inc('rate')
+        return wait
+
+    async def send(self, message_type, **fields):
+        await self.websocket.send(json.dumps({'type': message_type, **fields}, separators=(',', ':')))
+
+    async def send_clock(self, game_state):
+        await self.send(
+            'clock',
+            phase=game_state['game_phase'],
+            time_remaining=round(game.round_time_left(game_state), 1)
+        )
+
+    async def handle(self, message):
+        try:
+            payload = json.loads(message)
+            message_type = payload['type']
+        except (ValueError, KeyError, TypeError):
+            await self.send('error', message='Malformed message')
+            return
+
+        if message_type in ('submit', 'room_submit'):
+            wait = self.rate_limited()
+            if wait:
+                await self.send('result', success=False, message=RATE_LIMITED_MESSAGE,
+                                rate_limited=True, retry_after=math.ceil(wait))
+                return
+
+        if message_type == 'submit':
+            word = str(payload.get('word', '')).upper()
+            game_state, result = await self.apply(lambda state: game.submit_word_to_state(state, word))
+            if game_state is None:
+                await self.send('error', message='No game in progress')
+                return
+            await self.send('result', **result)
+            if result.get('round_over') or game_state['game_phase'] != 'playing':
+                await self.send('round_over', game_state=game.client_game_state(game_state))
+            self.clock_changed.set()
+        elif message_type == 'freeze':
+            game_state, outcome = await self.apply(game.freeze_round_clock)
+            if game_state is None:
+                await self.send('error', message='No game in progress')
+                return
+            success, text = outcome
+            await self.send('result', success=success, message=text)
+            if success:
+                await self.send_clock(game_state)
+                self.clock_changed.set()
+            elif game_state['game_phase'] == 'game_over':
+                await self.send('round_over', game_state=game.client_game_state(game_state))
+        elif message_type == 'sync':
+            # The player may have started a round over HTTP since the last message
+            async with self.lock:
+                _, game_state = await asyncio.to_thread(self._load, True)
+            if game_state is None:
+                await self.send('error', message='No game in progress')
+                return
+            await self.send('state', game_state=game.client_game_state(game_state))
+            await self.send_clock(game_state)
+            self.clock_changed.set()
+        elif message_type == 'watch_room':
+            room = await asyncio.to_thread(game.ROOMS.get, str(payload.get('room_id')))
+            if room is None:
+                await self.send('error', message='Room not found')
+                return
+            self.watch_room(room)
+            await self.send('room', **room.snapshot())
+        elif message_type == 'room_submit':
+            async with self.lock:
+                data, _ = await asyncio.to_thread(self._load)
+            player = data.get('rooms', {}).get(self.room.id) if self.room else None
+            if player is None:
+                await self.send('error', message='Join and watch a room first')
+                return
+            word = str(payload.get('word', '')).upper()
+            success, text, score = await asyncio.to_thread(
+                game.ROOMS.submit, self.room, player, word, game.ROUND_GRACE_SECONDS
+            )
+            await self.send('result', success=success, message=text, word=word, score=score)
+        else:
+            await self.send('error', message=f"Unknown message type {message_type!r}")
+
+    def _on_room_update(self, room_id, update):
+        # Called from whichever thread applied the event
+        self._loop.call_soon_threadsafe(self.room_updates.put_nowait, (room_id, update))
+
+    def watch_room(self, room):
+        self.unwatch_room()
+        self.room = room
+        room.add_listener(self._on_room_update)
+
+    def unwatch_room(self):
+        if self.room is not None:
+            self.room.remove_listener(self._on_room_update)
+            self.room = None
+
+    async def forward_room_updates(self):
+        # One sender keeps the room's events in order on the socket
+        while True:
+            room_id, update = await self.room_updates.get()
+            if self.room is not None and self.room.id == room_id:
+                await self.send('room_event', room_id=room_id, event=update)
+
+    async def run_clock(self):
+        """Sleep until the round deadline (or a change to it) and end the round on time.
+
+        Works from the connection's copy of the state; submit, freeze and sync
+        refresh it before setting clock_changed.
+        """
+        async with self.lock:
+            await asyncio.to_thread(self._load)
+        while True:
+            game_state = self.game_state
+            timeout = None
+            if game_state is not None and game_state['game_phase'] == 'playing' \
+                    and game_state.get('round_ends_at') is not None:
+                timeout = game.round_time_left(game_state) + game.ROUND_GRACE_SECONDS
+            self.clock_changed.clear()
+            try:
+                await asyncio.wait_for(self.clock_changed.wait(), timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+            game_state, expired = await self.apply(game.expire_round)
+            if expired:
+                await self.send('round_over', game_state=game.client_game_state(game_state))
+
+
+async def serve_player(websocket):
+    sid = session_id(websocket)
+    if sid is None or game.app.session_interface.store.get(sid) is None:
+        await websocket.close(code=4401, reason='No session; start a game over HTTP first')
+        return
+    connection = GameConnection(websocket, sid)
+    tasks = [asyncio.create_task(connection.run_clock()), asyncio.create_task(connection.forward_room_updates())]
+    try:
+        async for message in websocket:
+            await connection.handle(message)
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        connection.unwatch_room()
+        for task in tasks:
+            task.cancel()
+
+
+async def main(host, port):
+    if game.app.session_interface is None or not hasattr(game.app.session_interface, 'store'):
+        raise SystemExit('realtime.py needs a server-side SESSION_BACKEND (sqlite or memory)')
+    async with websockets.serve(serve_player, host, port, max_size=MAX_MESSAGE_BYTES):
+        log.info('realtime server listening', extra={'host': host, 'port': port})
+        await asyncio.Future()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(os.environ.get('REALTIME_HOST', '0.0.0.0'), int(os.environ.get('REALTIME_PORT', 8765))))
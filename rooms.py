@@ -0,0 +1,312 @@
+"""Multiplayer rooms: several players racing on one shared grid.
+
+Every change to a room travels over a pub/sub bus as an event, and each
+process applies the events it receives to its own copy of the room. Every
+copy sees the same events in the same order, so the copies agree. The first
+claim on a word wins no matter which worker accepted the request.
+
+``LocalBus`` delivers in-process and synchronously, which is enough for a
+single worker. ``SQLiteBus`` appends events to a shared SQLite table and
+every process tails it, so rooms span gunicorn workers and the realtime
+server. Both have the same four methods, so anything else with
+publish/subscribe/unsubscribe/sync (e.g. Redis) can replace them.
+
+Rooms are locked one at a time (never globally), and each room's listeners
+are only called for that room's events, so fan-out cost is per room.
+"""
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from process_local import DaemonThread, SQLiteDatabase
+
+log = logging.getLogger('app.rooms')
+
+LOBBY_CHANNEL = 'rooms'
+ROOM_EVENT_HISTORY = 200
+
+
+def room_channel(room_id):
+    return f'room:{room_id}'
+
+
+class LocalBus:
+    """In-process pub/sub; publish() runs the handlers before it returns"""
+
+    def __init__(self):
+        self._handlers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel, handler):
+        with self._lock:
+            # Copy on write so publishers can iterate without the lock
+            self._handlers[channel] = self._handlers.get(channel, ()) + (handler,)
+
+    def unsubscribe(self, channel, handler):
+        with self._lock:
+            handlers = tuple(h for h in self._handlers.get(channel, ()) if h != handler)
+            if handlers:
+                self._handlers[channel] = handlers
+            else:
+                self._handlers.pop(channel, None)
+
+    def publish(self, channel, message):
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(message)
+            except Exception:
+                log.exception('bus handler failed', extra={'channel': channel})
+
+    def sync(self):
+        """Deliver anything published elsewhere (nothing to do in-process)"""
+
+
+class SQLiteBus(LocalBus):
+    """Pub/sub over an append-only SQLite table shared by every process.
+
+    Each process tails the table from a background thread and delivers new
+    rows to its local handlers in id order. publish() and sync() catch up
+    first, so a publisher sees its own event applied by the time the call
+    returns. Events older than ``retention`` seconds are pruned; a process
+    starting up replays the ones still there.
+    """
+
+    def __init__(self, path, poll_interval=0.05, retention=3600):
+        super().__init__()
+        self._poll_interval = poll_interval
+        self._retention = retention
+        self._last_id = 0
+        self._poll_lock = threading.Lock()
+        self._db = SQLiteDatabase(path, (
+            'CREATE TABLE IF NOT EXISTS events ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, '
+            'payload TEXT NOT NULL, created REAL NOT NULL)',
+            'CREATE INDEX IF NOT EXISTS events_created ON events (created)'
+        ))
+        self._poller = DaemonThread(self._poll_forever, 'room-bus')
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # The parent's poller may have held this lock at fork time; the child's copy would never be released
+        self._poll_lock = threading.Lock()
+
+    def _poll_forever(self):
+        last_prune = 0
+        while True:
+            try:
+                self.sync()
+                if time.time() - last_prune > 60:
+                    last_prune = time.time()
+                    self._db.conn().execute('DELETE FROM events WHERE created < ?', (time.time() - self._retention,))
+            except sqlite3.Error:
+                log.exception('room bus poll failed')
+            time.sleep(self._poll_interval)
+
+    def subscribe(self, channel, handler):
+        self._poller.ensure()
+        super().subscribe(channel, handler)
+
+    def publish(self, channel, message):
+        self._poller.ensure()
+        self._db.conn().execute(
+            'INSERT INTO events (channel, payload, created) VALUES (?, ?, ?)',
+            (channel, json.dumps(message, separators=(',', ':')), time.time())
+        )
+        self.sync()
+
+    def sync(self):
+        """Deliver every event committed so far, in order"""
+        with self._poll_lock:
+            rows = self._db.conn().execute(
+                'SELECT id, channel, payload FROM events WHERE id > ? ORDER BY id', (self._last_id,)
+            ).fetchall()
+            for event_id, channel, payload in rows:
+                self._last_id = event_id
+                LocalBus.publish(self, channel, json.loads(payload))
+
+
+class Room:
+    """One room's replica, built purely from the events applied to it"""
+
+    def __init__(self, room_id, grid, words, ends_at):
+        self.id = room_id
+        self.grid = grid
+        self.words = words  # Shared solver result: word -> {path, score}; read-only
+        self.ends_at = ends_at
+        self.players = {}
+        self.found = {}  # word -> (player, claim)
+        self.events = deque(maxlen=ROOM_EVENT_HISTORY)
+        self.seq = 0
+        self.touched = time.time()
+        self.listeners = ()
+        self.lock = threading.Lock()
+
+    def apply(self, event):
+        """Apply a bus event; return the update to broadcast, or None if it changed nothing"""
+        with self.lock:
+            kind = event['type']
+            if kind == 'join':
+                if event['player'] in self.players:
+                    return None
+                self.players[event['player']] = 0
+                update = {'type': 'join', 'player': event['player']}
+            elif kind == 'word':
+                word, player = event['word'], event['player']
+                if word in self.found or player not in self.players:
+                    return None
+                self.found[word] = (player, event['claim'])
+                self.players[player] += event['score']
+                update = {
+                    'type': 'word', 'player': player, 'word': word,
+                    'score': event['score'], 'total': self.players[player]
+                }
+            else:
+                return None
+            self.seq += 1
+            update['seq'] = self.seq
+            self.events.append(update)
+            self.touched = time.time()
+            listeners = self.listeners
+        for listener in listeners:
+            try:
+                listener(self.id, update)
+            except Exception:
+                log.exception('room listener failed', extra={'room': self.id})
+        return update
+
+    def add_listener(self, listener):
+        """Call listener(room_id, update) for every update; it runs on the applying thread"""
+        with self.lock:
+            self.listeners += (listener,)
+
+    def remove_listener(self, listener):
+        with self.lock:
+            self.listeners = tuple(l for l in self.listeners if l != listener)
+
+    def time_left(self):
+        return max(0.0, self.ends_at - time.time())
+
+    def snapshot(self, since=None):
+        """Room state for a client; with since, the events after that seq (if still buffered)"""
+        with self.lock:
+            state = {
+                'room_id': self.id,
+                'seq': self.seq,
+                'time_remaining': round(self.time_left(), 1),
+                'scores': dict(self.players)
+            }
+            if since is not None and (since >= self.seq or (self.events and self.events[0]['seq'] <= since + 1)):
+                state['events'] = [event for event in self.events if event['seq'] > since]
+            else:
+                state['grid'] = self.grid
+                state['possible_words'] = len(self.words)
+                state['found_words'] = {word: owner[0] for word, owner in self.found.items()}
+            return state
+
+
+class RoomEngine:
+    """Creates rooms and turns player actions into bus events.
+
+    ``make_grid()`` deals the grid for a new room; ``solve(grid)`` returns the
+    shared solver result for it (see ``solve_board``).
+    """
+
+    def __init__(self, bus, make_grid, solve, round_seconds=120, max_rooms=1000, idle_timeout=3600):
+        self.bus = bus
+        self._make_grid = make_grid
+        self._solve = solve
+        self._round_seconds = round_seconds
+        self._max_rooms = max_rooms
+        self._idle_timeout = idle_timeout
+        self._rooms = {}
+        self._lock = threading.Lock()
+        self._subscribed = False
+
+    def _ensure_subscribed(self):
+        # Deferred to first use: subscribing starts the bus's poller, which
+        # must not run in a gunicorn --preload master that only imports the app
+        if self._subscribed:
+            return
+        with self._lock:
+            if not self._subscribed:
+                self.bus.subscribe(LOBBY_CHANNEL, self._on_lobby_event)
+                self._subscribed = True
+
+    def _on_lobby_event(self, event):
+        if event['type'] != 'created' or event['room_id'] in self._rooms:
+            return
+        room = Room(event['room_id'], event['grid'], self._solve(event['grid'])['words'], event['ends_at'])
+        with self._lock:
+            self._rooms[room.id] = room
+            self._evict()
+        self.bus.subscribe(room_channel(room.id), room.apply)
+
+    def _evict(self):
+        # Caller holds self._lock
+        cutoff = time.time() - self._idle_timeout
+        stale = [room_id for room_id, room in self._rooms.items() if room.touched < cutoff]
+        overflow = len(self._rooms) - len(stale) - self._max_rooms
+        if overflow > 0:
+            by_age = sorted(self._rooms.values(), key=lambda room: room.touched)
+            stale.extend(room.id for room in by_age[:overflow] if room.id not in stale)
+        for room_id in stale:
+            room = self._rooms.pop(room_id)
+            self.bus.unsubscribe(room_channel(room_id), room.apply)
+
+    def create_room(self):
+        self._ensure_subscribed()
+        room_id = secrets.token_urlsafe(6)
+        self.bus.publish(LOBBY_CHANNEL, {
+            'type': 'created',
+            'room_id': room_id,
+            'grid': self._make_grid(),
+            'ends_at': time.time() + self._round_seconds
+        })
+        return self.get(room_id)
+
+    def get(self, room_id):
+        """Return the room, or None if it doesn't exist (or has been evicted)"""
+        # Catch up first so a request sees every event committed before it, whichever worker sent it
+        self._ensure_subscribed()
+        self.bus.sync()
+        return self._rooms.get(room_id)
+
+    def join(self, room, player):
+        self.bus.publish(room_channel(room.id), {'type': 'join', 'player': player})
+
+    def submit(self, room, player, word, grace=0):
+        """Claim word for player; returns (success, message, score)"""
+        if player not in room.players:
+            return False, 'Join the room first', 0
+        if time.time() > room.ends_at + grace:
+            return False, "Time's up!", 0
+        solved = room.words.get(word)
+        if solved is None:
+            return False, 'Word not on the board', 0
+        if word in room.found:
+            return False, f"{room.found[word][0]} already found '{word}'", 0
+        claim = secrets.token_hex(8)
+        self.bus.publish(room_channel(room.id), {
+            'type': 'word', 'player': player, 'word': word, 'score': solved['score'], 'claim': claim
+        })
+        # Delivery is synchronous, so the claim has been settled against every earlier one
+        owner = room.found.get(word)
+        if owner is None or owner[1] != claim:
+            return False, f"{owner[0] if owner else 'Someone'} already found '{word}'", 0
+        return True, f"Found '{word}'! +{solved['score']} points", solved['score']
+
+
+def create_room_bus(app):
+    """Build the bus selected by ROOM_BUS (local or sqlite)"""
+    backend = os.environ.get('ROOM_BUS', 'local')
+    if backend == 'local':
+        return LocalBus()
+    if backend == 'sqlite':
+        path = os.environ.get('ROOM_BUS_PATH', os.path.join(app.instance_path, 'room_events.db'))
+        return SQLiteBus(path)
+    raise ValueError(f"Unknown ROOM_BUS {backend!r}")
@@ -0,0 +1,303 @@
+"""Headless run simulator for balancing the difficulty curve and card economy.
+
+Bots play whole runs through the game's own rules (``init_game_state``,
+``start_round``, ``submit_word_to_state``, ``shop_offer``/``apply_purchase``
+and ``advance_round``), so the numbers move with the real code. Boards come
+from a bank of vetted grids generated once in the parent process and
+inherited by the forked workers; solving boards isn't what's being balanced.
+
+Runs are split into chunks spread over a process pool. Each chunk seeds its
+own RNG from (seed, chunk index), so results don't depend on the number of
+processes. Each chunk returns small mergeable tallies, never per-run data.
+
+Usage:
+    WORDLIST_PATH=/path/to/words.txt python simulator.py --runs 100000 --processes 8
+    python simulator.py --strategy expert --goal-growth 1.2 1.3 1.4 --clear-bonus 40 60
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import app as game  # noqa: E402
+
+SCORE_BUCKET = 50
+
+
+# BOTS
+class Bot:
+    """Base strategy: how many words a player finds, which ones, and what they buy"""
+
+    words_per_second = 0.3
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def word_key(self, word):
+        return self.rng.random()
+
+    def find_words(self, words, seconds):
+        """Words found this round, in the order they're played"""
+        expected = self.words_per_second * seconds
+        count = max(0, int(self.rng.gauss(expected, expected ** 0.5)))
+        return sorted(words, key=self.word_key)[:count]
+
+    def shop(self, game_state, cards, upgrades):
+        """Items to try to buy, in order (apply_purchase enforces coins)"""
+        return []
+
+
+class CasualBot(Bot):
+    """Finds mostly short words; buys the cheapest card on offer"""
+
+    words_per_second = 0.25
+
+    def word_key(self, word):
+        return self.rng.random() * len(word)
+
+    def shop(self, game_state, cards, upgrades):
+        return sorted(cards, key=lambda card: card['cost'])[:1]
+
+
+class ExpertBot(Bot):
+    """Finds long words faster; upgrades what it owns, then buys the priciest card it can"""
+
+    words_per_second = 0.5
+
+    def word_key(self, word):
+        return self.rng.random() / len(word)
+
+    def shop(self, game_state, cards, upgrades):
+        affordable = [card for card in cards if card['cost'] <= game_state['coins']]
+        return upgrades + sorted(affordable, key=lambda card: -card['cost'])[:1]
+
+
+class SaverBot(CasualBot):
+    """Plays like CasualBot but never buys anything (the no-cards baseline)"""
+
+    def shop(self, game_state, cards, upgrades):
+        return []
+
+
+STRATEGIES = {'casual': CasualBot, 'expert': ExpertBot, 'saver': SaverBot}
+
+
+# BOARDS
+class GridBank:
+    """A fixed set of vetted, pre-solved grids per difficulty tier"""
+
+    def __init__(self, per_tier, rng):
+        self.grids = {}
+        for tier in range(len(game.GRID_QUALITY_TIERS)):
+            self.grids[tier] = []
+            for _ in range(per_tier):
+                grid, solution = game.generate_quality_grid(tier, rng)
+                game.cache_board_solution(grid, solution)
+                self.grids[tier].append((grid, solution))
+        self.rng = rng
+
+    def deal(self, game_state):
+        """Drop-in for deal_grid"""
+        grid, solution = self.rng.choice(self.grids[game.grid_tier(game_state['goal_score'])])
+        game_state['grid'] = grid
+        game_state['possible_words'] = solution['word_count']
+        game_state['max_possible_score'] = solution['max_score']
+
+
+# SIMULATION
+class Tally:
+    """Mergeable aggregate of many runs"""
+
+    def __init__(self):
+        self.runs = 0
+        self.victories = 0
+        self.final_ante = Counter()
+        self.rounds = Counter()                  # ante -> rounds played
+        self.cleared = Counter()                 # ante -> rounds cleared
+        self.scores = defaultdict(Counter)       # ante -> score bucket -> rounds
+        self.card_runs = Counter()               # card -> runs that owned it at the end
+        self.card_victories = Counter()
+        self.card_rounds = Counter()             # card -> rounds played owning it
+        self.card_cleared = Counter()
+
+    def merge(self, other):
+        self.runs += other.runs
+        self.victories += other.victories
+        for name in ('final_ante', 'rounds', 'cleared', 'card_runs', 'card_victories', 'card_rounds', 'card_cleared'):
+            getattr(self, name).update(getattr(other, name))
+        for ante, buckets in other.scores.items():
+            self.scores[ante].update(buckets)
+        return self
+
+
+def play_run(bot, bank, tally):
+    game_state = game.init_game_state()
+    while True:
+        game.start_round(game_state, deal=bank.deal)
+        ante, deck = game_state['ante'], set(game_state['power_deck'])
+        seconds = game.ROUND_SECONDS
+        if 'time_freeze' in deck:
+            seconds += game.CARD_REGISTRY['time_freeze']['value']
+        for word in bot.find_words(game.solve_board(game_state['grid'])['words'], seconds):
+            game.submit_word_to_state(game_state, word)
+            if game_state['game_phase'] != 'playing':
+                break
+        cleared = game_state['game_phase'] == 'shop'
+
+        tally.rounds[ante] += 1
+        tally.cleared[ante] += cleared
+        tally.scores[ante][game_state['score'] // SCORE_BUCKET * SCORE_BUCKET] += 1
+        for card in deck:
+            tally.card_rounds[card] += 1
+            tally.card_cleared[card] += cleared
+        if not cleared:
+            break
+
+        offer = game.expand_cards(game.shop_offer(game_state['run_seed'], ante, game_state['round']), game.CARD_REGISTRY)
+        upgrades = [
+            game.CARD_REGISTRY[upgrade['id']]
+            for card_id in game_state['power_deck']
+            for upgrade in game.CARD_REGISTRY[card_id].get('upgrades', [])
+        ]
+        for item in bot.shop(game_state, offer, upgrades):
+            game.apply_purchase(game_state, item)
+        game.advance_round(game_state)
+        if game_state['game_phase'] == 'victory':
+            break
+
+    won = game_state['game_phase'] == 'victory'
+    tally.runs += 1
+    tally.victories += won
+    tally.final_ante[min(game_state['ante'], game.MAX_ANTE)] += 1
+    for card in set(game_state['power_deck']):
+        tally.card_runs[card] += 1
+        tally.card_victories[card] += won
+
+
+def simulate_chunk(chunk_index, runs, seed, strategy, params):
+    """Play runs for one chunk; safe to call in any worker process"""
+    for name, value in params.items():
+        setattr(game, name, value)
+    game.EVENT_LOG = None  # Simulated runs stay out of the analytics log
+    chunk_seed = seed * 1000003 + chunk_index
+    # init_game_state and the packs use the global RNG
+    random.seed(chunk_seed)
+    rng = random.Random(chunk_seed)
+    bank = BANK
+    bank.rng = rng
+    bot = STRATEGIES[strategy](rng)
+    tally = Tally()
+    for _ in range(runs):
+        play_run(bot, bank, tally)
+    return tally
+
+
+BANK = None
+
+
+def simulate(runs, strategy, params, processes, chunk_size, seed):
+    chunks = [
+        (index, min(chunk_size, runs - start), seed, strategy, params)
+        for index, start in enumerate(range(0, runs, chunk_size))
+    ]
+    total = Tally()
+    if processes <= 1:
+        for chunk in chunks:
+            total.merge(simulate_chunk(*chunk))
+        return total
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('fork')) as pool:
+        for tally in pool.map(simulate_chunk, *zip(*chunks)):
+            total.merge(tally)
+    return total
+
+
+def bucket_percentile(buckets, pct):
+    total = sum(buckets.values())
+    running = 0
+    for score in sorted(buckets):
+        running += buckets[score]
+        if running >= total * pct / 100:
+            return score
+    return 0
+
+
+def report(tally):
+    """Plain dict of the headline numbers (also what --json prints)"""
+    return {
+        'runs': tally.runs,
+        'win_rate': tally.victories / tally.runs if tally.runs else 0.0,
+        'final_ante': dict(sorted(tally.final_ante.items())),
+        'antes': {
+            ante: {
+                'rounds': tally.rounds[ante],
+                'clear_rate': tally.cleared[ante] / tally.rounds[ante],
+                'score_p10': bucket_percentile(tally.scores[ante], 10),
+                'score_p50': bucket_percentile(tally.scores[ante], 50),
+                'score_p90': bucket_percentile(tally.scores[ante], 90)
+            }
+            for ante in sorted(tally.rounds)
+        },
+        'cards': {
+            card: {
+                'runs': tally.card_runs[card],
+                'win_rate': tally.card_victories[card] / tally.card_runs[card] if tally.card_runs[card] else 0.0,
+                'round_clear_rate': tally.card_cleared[card] / tally.card_rounds[card]
+            }
+            for card in sorted(tally.card_rounds)
+        }
+    }
+
+
+def print_report(label, summary, elapsed):
+    print(f"== {label}: {summary['runs']} runs in {elapsed:.1f}s, "
+          f"win rate {summary['win_rate']:.1%}, final ante {summary['final_ante']}")
+    print(f"{'ante':>5} {'rounds':>8} {'clear':>7} {'p10':>6} {'p50':>6} {'p90':>6}")
+    for ante, stats in summary['antes'].items():
+        print(f"{ante:>5} {stats['rounds']:8d} {stats['clear_rate']:7.1%} "
+              f"{stats['score_p10']:6d} {stats['score_p50']:6d} {stats['score_p90']:6d}")
+    print(f"{'card':<22} {'runs':>7} {'win':>7} {'clear':>7}")
+    for card, stats in summary['cards'].items():
+        print(f"{card:<22} {stats['runs']:7d} {stats['win_rate']:7.1%} {stats['round_clear_rate']:7.1%}")
+
+
+def main():
+    global BANK
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10000, help='runs per parameter set')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='casual')
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=250, help='runs per pool task')
+    parser.add_argument('--bank', type=int, default=24, help='pre-solved grids per difficulty tier')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--goal-growth', type=float, nargs='+', default=[game.GOAL_GROWTH])
+    parser.add_argument('--clear-bonus', type=int, nargs='+', default=[game.ROUND_CLEAR_BONUS])
+    parser.add_argument('--rounds-per-ante', type=int, nargs='+', default=[game.ROUNDS_PER_ANTE])
+    parser.add_argument('--json', action='store_true', help='print one JSON report per parameter set')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # Built before the pool forks, so every worker shares the same boards
+    BANK = GridBank(args.bank, random.Random(args.seed))
+    print(f"grid bank ready in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    for growth, bonus, rounds in itertools.product(args.goal_growth, args.clear_bonus, args.rounds_per_ante):
+        params = {'GOAL_GROWTH': growth, 'ROUND_CLEAR_BONUS': bonus, 'ROUNDS_PER_ANTE': rounds}
+        started = time.perf_counter()
+        summary = report(simulate(args.runs, args.strategy, params, args.processes, args.chunk, args.seed))
+        if args.json:
+            print(json.dumps({'strategy': args.strategy, 'params': params, **summary}))
+        else:
+            label = f"{args.strategy} growth={growth} bonus={bonus} rounds/ante={rounds}"
+            print_report(label, summary, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
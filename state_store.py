@@ -0,0 +1,198 @@
+"""Server-side session storage.
+
+The cookie only carries a signed, opaque session ID; the game state itself
+lives in a pluggable store. ``MemoryStore`` keeps live dicts in an in-process
+LRU (single worker / development). ``SQLiteStore`` keeps state in a WAL-mode
+SQLite file shared by every gunicorn worker; each save is written through,
+so a player's next request sees it on any worker.
+"""
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+from process_local import DaemonThread, SQLiteDatabase
+
+log = logging.getLogger('app.sessions')
+
+
+class MemoryStore:
+    """In-process LRU of session dicts; nothing is serialized"""
+
+    def __init__(self, capacity=10000):
+        self._capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            data = self._items.get(sid)
+            if data is not None:
+                self._items.move_to_end(sid)
+            return data
+
+    def set(self, sid, data):
+        """Store data for sid; returns its new stamp"""
+        with self._lock:
+            self._items[sid] = data
+            self._items.move_to_end(sid)
+            while len(self._items) > self._capacity:
+                self._items.popitem(last=False)
+        return id(data)
+
+    def delete(self, sid):
+        with self._lock:
+            self._items.pop(sid, None)
+
+    def stamp(self, sid):
+        """Changes whenever sid's session is saved again (the stored dict's identity).
+
+        A caller comparing stamps holds the dict it stamped, so the id can't be reused.
+        """
+        with self._lock:
+            data = self._items.get(sid)
+        return None if data is None else id(data)
+
+
+class SQLiteStore:
+    """Session dicts stored as compact JSON in SQLite, written through.
+
+    Every ``set`` is one autocommitted UPSERT (cheap under WAL with
+    synchronous=NORMAL), so the next request sees it whichever worker
+    serves it. A background thread deletes sessions idle for ``max_age``.
+    """
+
+    def __init__(self, path, max_age=31 * 24 * 3600, expire_interval=3600):
+        self._max_age = max_age
+        self._expire_interval = expire_interval
+        self._db = SQLiteDatabase(path, (
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            'sid TEXT PRIMARY KEY, data TEXT NOT NULL, updated REAL NOT NULL)',
+            'CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated)'
+        ))
+        self._expirer = DaemonThread(self._expire_forever, 'session-expiry')
+
+    def _expire_forever(self):
+        while True:
+            try:
+                self._db.conn().execute(
+                    'DELETE FROM sessions WHERE updated < ?', (time.time() - self._max_age,)
+                )
+            except sqlite3.Error:
+                log.warning('session expiry failed; retrying', exc_info=True)
+            time.sleep(self._expire_interval)
+
+    def get(self, sid):
+        row = self._db.conn().execute('SELECT data FROM sessions WHERE sid = ?', (sid,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def set(self, sid, data):
+        """Store data for sid; returns its new stamp"""
+        self._expirer.ensure()
+        updated = time.time()
+        self._db.conn().execute(
+            'INSERT INTO sessions (sid, data, updated) VALUES (?, ?, ?) '
+            'ON CONFLICT(sid) DO UPDATE SET data = excluded.data, updated = excluded.updated',
+            (sid, json.dumps(data, separators=(',', ':')), updated)
+        )
+        return updated
+
+    def stamp(self, sid):
+        """When sid's session was last saved: a check for changes that skips decoding it"""
+        row = self._db.conn().execute('SELECT updated FROM sessions WHERE sid = ?', (sid,)).fetchone()
+        return None if row is None else row[0]
+
+    def delete(self, sid):
+        self._db.conn().execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface that keeps only a signed session ID in the cookie"""
+
+    salt = 'game-session'
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt=self.salt)
+
+    def sid_from_cookie(self, app, cookie_value):
+        """Return the session ID in a cookie value, or None if it is missing or forged"""
+        if not cookie_value:
+            return None
+        try:
+            return self._signer(app).unsign(cookie_value).decode()
+        except BadSignature:
+            return None
+
+    def open_session(self, app, request):
+        sid = self.sid_from_cookie(app, request.cookies.get(self.get_cookie_name(app)))
+        if sid is not None:
+            data = self.store.get(sid)
+            if data is not None:
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(24), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified or session.new:
+            self.store.set(session.sid, dict(session))
+
+        if session.new or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid).decode(),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app)
+            )
+
+
+def create_session_interface(app):
+    """Build the session interface selected by SESSION_BACKEND (sqlite, memory or cookie)"""
+    backend = os.environ.get('SESSION_BACKEND', 'sqlite')
+    if backend == 'cookie':
+        return None
+    if backend == 'memory':
+        return ServerSideSessionInterface(MemoryStore(int(os.environ.get('SESSION_CACHE_SIZE', 10000))))
+    if backend == 'sqlite':
+        path = os.environ.get('SESSION_DB_PATH', os.path.join(app.instance_path, 'sessions.db'))
+        return ServerSideSessionInterface(SQLiteStore(path))
+    raise ValueError(f"Unknown SESSION_BACKEND {backend!r}")
@@ -111,10 +111,17 @@ function setupEventListeners() {
 }
 
 function loadGameState() {
-    fetch('/api/game_state')
+    // Once we hold a revision, only ask for what changed since then
+    const since = gameState && gameState.revision !== undefined ? `?since=${gameState.revision}` : '';
+    return fetch('/api/game_state' + since)
         .then(response => response.json())
         .then(data => {
-            gameState = data;
+            if (data.changes) {
+                Object.assign(gameState, data.changes);
+                gameState.revision = data.revision;
+            } else {
+                gameState = data.game_state || data;
+            }
             updateDisplay();
         })
         .catch(error => console.error('Error loading game state:', error));
@@ -350,9 +357,40 @@ function updateProgressBar() {
     progressText.textContent = `${currentScore} / ${goalScore}`;
 }
 
+function highlightPath(path) {
+    path.forEach(([row, col]) => {
+        const cell = document.querySelector(`[data-row="${row}"][data-col="${col}"]`);
+        if (cell) cell.classList.add('hinted');
+    });
+    setTimeout(() => {
+        document.querySelectorAll('.letter-cell.hinted').forEach(cell => cell.classList.remove('hinted'));
+    }, 4000);
+}
+
 function useEffectCard(card) {
-    // Placeholder for effect card usage
-    showMessage(`Used ${card.name}! (Feature coming soon)`, 'info');
+    fetch('/api/use_effect', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ card_id: card.id })
+    })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // The server owns the clock; take its remaining time
+                gameState.time_remaining = data.time_remaining;
+                // Mark the hint once the refreshed grid is drawn
+                loadGameState().then(() => {
+                    if (data.hint) highlightPath(data.hint.path);
+                });
+                showMessage(data.message, 'success');
+            } else {
+                showMessage(data.message, 'error');
+                if (data.round_over) {
+                    loadGameState().then(() => showPhase(gameState.game_phase));
+                }
+            }
+        })
+        .catch(error => console.error('Error using effect card:', error));
 }
 
 function showStats() {
@@ -576,13 +614,16 @@ function shuffleGrid() {
 }
 
 function loadShopItems() {
-    fetch('/api/shop_items')
-        .then(response => response.json())
-        .then(data => {
-            renderShopCards(data.cards || []);
-            renderShopUpgrades(data.upgrades || []);
-            renderShopEffectCards(data.effect_cards || []);
-            renderShopPacks(data.packs || []);
+    // The catalog is static and revalidated by ETag (usually a 304); only the offer is per player
+    Promise.all([
+        fetch('/api/shop_catalog').then(response => response.json()),
+        fetch('/api/shop_items?offer_only=1').then(response => response.json())
+    ])
+        .then(([catalog, offer]) => {
+            renderShopCards(offer.cards || []);
+            renderShopUpgrades(offer.upgrades || []);
+            renderShopEffectCards(catalog.effect_cards || []);
+            renderShopPacks(catalog.packs || []);
         })
         .catch(error => console.error('Error loading shop:', error));
 }
@@ -0,0 +1,6 @@
+import os
+
+# Set before any test module imports app: no event log, sessions in memory, no rate limits
+os.environ.setdefault('EVENT_LOG', 'off')
+os.environ.setdefault('SESSION_BACKEND', 'memory')
+os.environ.setdefault('RATE_LIMIT', 'off')
@@ -0,0 +1,37 @@
+import pytest
+
+import app as game
+from admission import AdmissionControl, TokenBucketLimiter, is_limited
+
+
+@pytest.mark.parametrize('path, limited', [
+    ('/api/submit_word', True),
+    ('/api/submit_words', True),
+    ('/api/rooms/abc123/submit_word', True),
+    ('/api/daily/submit_word', True),
+    ('/api/select_challenge', False),
+    ('/submit_word', False),
+])
+def test_every_submit_route_is_limited(path, limited):
+    assert is_limited({'PATH_INFO': path, 'REQUEST_METHOD': 'POST'}) is limited
+    assert not is_limited({'PATH_INFO': path, 'REQUEST_METHOD': 'GET'})
+
+
+def test_room_submissions_share_the_session_bucket():
+    def accept(environ, start_response):
+        start_response('200 OK', [])
+        return [b'{}']
+
+    statuses = []
+    control = AdmissionControl(accept, game.app, TokenBucketLimiter(rate=1, burst=2), max_concurrent=4)
+    for path in ('/api/submit_word', '/api/rooms/abc123/submit_word', '/api/daily/submit_word'):
+        environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'POST', 'REMOTE_ADDR': '10.0.0.1'}
+        control(environ, lambda status, headers: statuses.append(status))
+    assert statuses == ['200 OK', '200 OK', '429 Too Many Requests']
+
+
+def test_batch_costs_one_token_per_word():
+    limiter = TokenBucketLimiter(rate=5, burst=15)
+    assert limiter.take('player', cost=100, now=0) == 0
+    # The batch left the bucket 85 words in debt: the next word waits for it to refill
+    assert limiter.take('player', now=1) == pytest.approx((1 + 80) / 5)
@@ -0,0 +1,31 @@
+from board import find_word_path, letter_mask, trace_word
+
+GRID = [
+    list('CATS'),
+    list('XOXE'),
+    list('XXDX'),
+    list('AXXX'),
+]
+
+
+def test_trace_word_follows_adjacent_cells():
+    assert find_word_path(GRID, 'CATS') == [[0, 0], [0, 1], [0, 2], [0, 3]]
+    # Diagonals count: C(0,0) -> O(1,1) -> D(2,2)
+    assert find_word_path(GRID, 'cod') == [[0, 0], [1, 1], [2, 2]]
+    assert find_word_path(GRID, 'TOE') is None  # O and E aren't neighbours
+
+
+def test_trace_word_never_reuses_a_cell():
+    assert find_word_path(GRID, 'TAT') is None
+    assert find_word_path([list('ABA')], 'ABA') == [[0, 0], [0, 1], [0, 2]]
+    assert find_word_path([list('AB')], 'ABA') is None
+
+
+def test_trace_word_rejects_missing_letters_before_searching():
+    assert trace_word('CATS', ((1,), (0, 2), (1, 3), (2,)), 'CAST') is None
+    assert find_word_path(GRID, 'CAA') is None
+    assert find_word_path(GRID, '') is None
+
+
+def test_letter_mask_ignores_non_letters():
+    assert letter_mask("DON'T 2-A") == letter_mask('DONTA')
@@ -0,0 +1,31 @@
+import random
+
+import app as game
+
+
+def test_grid_tiers_cover_the_goal_curve():
+    goal = 100
+    for _ in range(game.ROUNDS_PER_ANTE * game.MAX_ANTE):
+        max_goal, _, _ = game.GRID_QUALITY_TIERS[game.grid_tier(goal)]
+        assert goal <= max_goal
+        goal = int(goal * game.GOAL_GROWTH)
+
+
+def test_quality_grid_has_the_tier_size():
+    rng = random.Random(1)
+    for tier, (_, size, _) in enumerate(game.GRID_QUALITY_TIERS):
+        grid, solution = game.generate_quality_grid(tier, rng)
+        assert len(grid) == size and all(len(row) == size for row in grid)
+        assert solution == game.compute_board_solution(grid)
+
+
+def test_one_board_dealt_per_round(monkeypatch):
+    game_state = game.init_game_state()
+    game.start_round(game_state)
+    pop = game.GRID_POOL.pop
+    deals = []
+    monkeypatch.setattr(game.GRID_POOL, 'pop', lambda tier: deals.append(tier) or pop(tier))
+    game_state['game_phase'] = 'shop'
+    game.advance_round(game_state)
+    game.start_round(game_state)
+    assert len(deals) == 1
@@ -0,0 +1,45 @@
+from board import solve_grid
+from hints import HintEngine
+from lexicon import Lexicon
+
+GRID = [list('STONE'), list('XXXSX'), list('XXXXX'), list('XXXXX'), list('XXXXX')]
+
+
+def score_word(word):
+    return len(word) * 10
+
+
+def hint_engine(words):
+    lexicon = Lexicon.from_words(words)
+
+    def solve(grid):
+        found = solve_grid(grid, lexicon)
+        return {'words': {
+            word: {'path': [[cell // 5, cell % 5] for cell in path], 'score': score_word(word)}
+            for word, path in found.items()
+        }}
+
+    return HintEngine(lexicon, solve, score_word)
+
+
+def test_highlight_skips_found_and_highlighted_words():
+    highlighted = []
+    for _ in range(2):
+        # A fresh engine each time, like another worker serving the card
+        word, _ = hint_engine(['STONE', 'TONES', 'NOTES']).highlight(GRID, {}, highlighted)
+        highlighted.append(word)
+    assert sorted(highlighted) == ['STONE', 'TONES']
+    assert hint_engine(['STONE', 'TONES']).highlight(GRID, {'TONES': 0}, ['STONE']) is None
+
+
+def test_combo_letters_adds_a_word():
+    grid, changes = hint_engine(['STONE', 'TONES', 'NOTES']).combo_letters(GRID, {})
+    assert changes == [{'row': 1, 'col': 2, 'letter': 'E'}]
+    assert grid[1][2] == 'E' and GRID[1][2] == 'X'
+
+
+def test_combo_letters_never_lowers_the_board():
+    # Every letter placed could only repeat a word the board already has
+    grid, changes = hint_engine(['STONE', 'TONES']).combo_letters(GRID, {})
+    assert changes == []
+    assert grid == GRID
@@ -0,0 +1,35 @@
+import pytest
+
+from lexicon import Lexicon, normalize_word
+
+WORDS = ['cat', 'cats', 'CAR', 'care', 'dog', 'do', "don't", 'zebra']
+
+
+def test_from_words_keeps_valid_words_only():
+    lexicon = Lexicon.from_words(WORDS)
+    assert sorted(lexicon) == ['CAR', 'CARE', 'CAT', 'CATS', 'DOG', 'ZEBRA']
+    assert 'cat' in lexicon and 'CA' not in lexicon and 'DO' not in lexicon
+    assert lexicon.has_prefix('ZEB') and not lexicon.has_prefix('ZEBRAS')
+
+
+def test_save_and_open_round_trip(tmp_path):
+    lexicon = Lexicon.from_words(WORDS)
+    path = str(tmp_path / 'words.lex')
+    lexicon.save(path)
+    opened = Lexicon.open(path)
+    assert len(opened) == len(lexicon)
+    assert list(opened) == list(lexicon)
+    assert list(opened.words_with_prefix('CA')) == ['CAR', 'CARE', 'CAT', 'CATS']
+    assert 'DOGS' not in opened and opened.child(opened.root, 'Q') < 0
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('cat\ndog\n')
+    with pytest.raises(ValueError):
+        Lexicon.open(str(path))
+
+
+@pytest.mark.parametrize('raw, expected', [(' cat\n', 'CAT'), ("don't", None), ('café', None), ('', None)])
+def test_normalize_word(raw, expected):
+    assert normalize_word(raw) == expected
@@ -0,0 +1,24 @@
+import threading
+
+from process_local import DaemonThread, SQLiteDatabase
+
+
+def test_daemon_thread_starts_once_per_process():
+    started = []
+    release = threading.Event()
+    thread = DaemonThread(release.wait, 'test-daemon', on_start=lambda: started.append(True))
+    for _ in range(3):
+        thread.ensure()
+    release.set()
+    assert started == [True]
+
+
+def test_sqlite_database_gives_each_thread_its_own_connection(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / 'nested' / 'test.db'), ('CREATE TABLE items (value INTEGER)',))
+    assert db.conn() is db.conn()
+    other = []
+    worker = threading.Thread(target=lambda: other.append(db.conn()))
+    worker.start()
+    worker.join()
+    assert other[0] is not db.conn()
+    assert db.conn().execute('PRAGMA journal_mode').fetchone() == ('wal',)
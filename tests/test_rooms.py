@@ -0,0 +1,22 @@
+from rooms import LOBBY_CHANNEL, LocalBus, RoomEngine
+
+
+class RecordingBus(LocalBus):
+    def __init__(self):
+        super().__init__()
+        self.channels = []
+
+    def subscribe(self, channel, handler):
+        self.channels.append(channel)
+        super().subscribe(channel, handler)
+
+
+def test_engine_subscribes_on_first_use_only():
+    bus = RecordingBus()
+    grid = [list('CATSX')] * 5
+    engine = RoomEngine(bus, lambda: grid, lambda grid: {'words': {}})
+    assert bus.channels == []
+    assert engine.get('missing') is None
+    room = engine.create_room()
+    assert bus.channels == [LOBBY_CHANNEL, f'room:{room.id}']
+    assert engine.get(room.id) is room
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+import app as game
+from board import letter_mask
+
+WORDS = ['CAT', 'STONE', 'AUDIO', 'QUEUE', 'RHYTHM', 'TEASE', 'NOTES', 'ONSET', 'XYZ', 'ABRACADABRA']
+
+
+def baseline_score(word, cards, found_words, last_round_letters):
+    """The original per-card scoring loop, kept as the reference"""
+    base_score = len(word) * 10
+    bonus_score = 0
+    for card in cards:
+        card_bonus = 0
+        if card['effect_type'] == 'vowel_bonus':
+            card_bonus = sum(1 for c in word if c.lower() in 'aeiou') * card['value']
+        elif card['effect_type'] == 'repeat_bonus' and last_round_letters:
+            card_bonus = sum(1 for c in word if c.upper() in last_round_letters) * card['value']
+        elif card['effect_type'] == 'score_multiplier':
+            if len(word) >= 5:
+                card_bonus = base_score
+        elif card['effect_type'] == 'anagram_bonus' and len(found_words) > 0:
+            if len(set(word.lower()) & set(found_words[-1].lower())) >= 3:
+                card_bonus = card['value']
+        elif card['effect_type'] == 'grid_modifier':
+            card_bonus = 15 * card['value']
+        bonus_score += max(card_bonus, 0)
+    return base_score + bonus_score
+
+
+def score_both(deck, found_words, last_round_letters):
+    plan = game.compile_scoring_plan(deck)
+    masks = {word: letter_mask(word) for word in found_words}
+    cards = game.expand_cards(deck, game.CARD_REGISTRY)
+    for word in WORDS:
+        score, effects = game.calculate_word_score(word, plan, masks, last_round_letters)
+        assert score == baseline_score(word, cards, found_words, last_round_letters), (word, deck)
+        assert score == len(word) * 10 + sum(effect['bonus'] for effect in effects)
+
+
+@pytest.mark.parametrize('deck', [
+    [],
+    list(game.CARD_REGISTRY),
+    ['vowel_surge', 'vowel_surge', 'vowel_surge'],
+    ['word_multiplier', 'word_multiplier', 'anagram_amplifier', 'anagram_amplifier'],
+    ['vowel_surge', 'vowel_frenzy', 'echo_chamber', 'echo_loop', 'wildcard', 'double_wildcard', 'letter_leech'],
+])
+def test_scoring_plan_matches_per_card_scoring(deck):
+    score_both(deck, [], {})
+    score_both(deck, ['NOTES'], {'S': 2, 'T': 1, 'E': 3})
+
+
+def test_scoring_plan_matches_on_random_decks():
+    rng = random.Random(7)
+    card_ids = list(game.CARD_REGISTRY)
+    for _ in range(50):
+        deck = rng.choices(card_ids, k=rng.randint(1, 12))  # Duplicates included
+        score_both(deck, rng.sample(WORDS, 2), {letter: 1 for letter in rng.sample('AEIOUSTN', 4)})
+
+
+def test_duplicate_cards_merge_into_one_effect():
+    plan = game.compile_scoring_plan(['vowel_surge', 'vowel_surge'])
+    _, effects = game.calculate_word_score('AUDIO', plan, {}, {})
+    card = game.CARD_REGISTRY['vowel_surge']
+    assert effects == [{
+        'card_name': f"{card['name']} x2",
+        'icon': card['icon'],
+        'bonus': 4 * 2 * card['value'],
+        'message': f"{card['name']} x2: +{4 * 2 * card['value']} points!"
+    }]
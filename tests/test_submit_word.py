@@ -0,0 +1,124 @@
+import pytest
+
+import app as game
+
+
+@pytest.fixture
+def client():
+    client = game.app.test_client()
+    client.post('/api/start_game')
+    client.post('/api/select_challenge', json={'type': 'standard'})
+    return client
+
+
+@pytest.mark.parametrize('word', ["DON'T", 'A B', 'CAT1', 'CAFÉ', ''])
+def test_submit_word_rejects_non_letters(client, word):
+    response = client.post('/api/submit_word', json={'word': word})
+    assert response.status_code == 200
+    assert response.get_json() == {'success': False, 'message': 'Invalid word', 'round_over': False}
+
+
+def test_submit_words_keeps_the_rest_of_a_batch(client):
+    grid = client.get('/api/game_state').get_json()['grid']
+    word = next(iter(game.solve_board(grid)['words']), None)
+    if word is None:
+        pytest.skip('no findable word on this grid')
+    response = client.post('/api/submit_words', json={'words': ['A B', word]})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['success'] for result in results] == [False, True]
+
+
+def test_words_only_score_while_playing():
+    client = game.app.test_client()
+    client.post('/api/start_game')
+    grid = client.get('/api/game_state').get_json()['grid']
+    word = next(iter(game.solve_board(grid)['words']), 'CAT')
+    result = client.post('/api/submit_word', json={'word': word}).get_json()
+    assert result['success'] is False
+    state = client.post('/api/select_challenge', json={'type': 'standard'}).get_json()['game_state']
+    assert state['score'] == 0
+
+
+def test_time_freeze_cannot_revive_an_expired_round(client):
+    with client.session_transaction() as session:
+        game_state = session['game_state']
+        game_state['round_ends_at'] -= game.ROUND_SECONDS + 5
+        game_state['effect_cards'] = ['time_freeze']
+        session['game_state'] = game_state
+    result = client.post('/api/use_effect', json={'card_id': 'time_freeze'}).get_json()
+    assert result == {'success': False, 'message': "Time's up!", 'round_over': True}
+    assert client.get('/api/game_state').get_json()['game_phase'] == 'game_over'
+
+
+def set_phase(client, phase):
+    with client.session_transaction() as session:
+        game_state = session['game_state']
+        game_state['game_phase'] = phase
+        session['game_state'] = game_state
+
+
+@pytest.mark.parametrize('phase', ['playing', 'shop', 'game_over', 'victory'])
+def test_select_challenge_only_starts_a_waiting_round(client, phase):
+    set_phase(client, phase)
+    result = client.post('/api/select_challenge', json={'type': 'standard'}).get_json()
+    assert result == {'success': False, 'message': 'No round to start'}
+    assert client.get('/api/game_state').get_json()['game_phase'] == phase
+
+
+def test_expired_run_cannot_be_resumed(client):
+    with client.session_transaction() as session:
+        game_state = session['game_state']
+        game_state['round_ends_at'] -= game.ROUND_SECONDS + 5
+        session['game_state'] = game_state
+    assert client.post('/api/submit_word', json={'word': 'CAT'}).get_json()['message'] == "Time's up!"
+    assert client.post('/api/select_challenge', json={'type': 'standard'}).get_json()['success'] is False
+    assert client.get('/api/game_state').get_json()['game_phase'] == 'game_over'
+
+
+@pytest.mark.parametrize('phase', ['challenge_select', 'playing', 'game_over'])
+def test_continue_only_leaves_the_shop(client, phase):
+    set_phase(client, phase)
+    round_before = client.get('/api/game_state').get_json()['round']
+    result = client.post('/api/continue_to_next_round').get_json()
+    assert result == {'success': False, 'message': 'Clear the round first'}
+    assert client.get('/api/game_state').get_json()['round'] == round_before
+
+
+class RecordingLog:
+    def __init__(self):
+        self.events = []
+
+    def append(self, kind, fields):
+        self.events.append((kind, fields))
+
+
+def test_event_log_keeps_only_effect_types_and_bonuses(monkeypatch):
+    monkeypatch.setattr(game, 'EVENT_LOG', RecordingLog())
+    game_state = game.init_game_state()
+    game.start_round(game_state)
+    game_state['power_deck'] = ['vowel_surge', 'vowel_surge']
+    game_state['scoring_plan'] = game.compile_scoring_plan(game_state['power_deck'])
+    word = next((word for word in game.solve_board(game_state['grid'])['words'] if 'A' in word), None)
+    if word is None:
+        pytest.skip('no findable word with a vowel on this grid')
+    assert game.submit_word_to_state(game_state, word)['success']
+    kind, fields = game.EVENT_LOG.events[-1]
+    vowels = sum(1 for c in word if c in 'AEIOU')
+    assert kind == 'submit_word'
+    assert fields['effects'] == [['vowel_bonus', vowels * 2 * game.CARD_REGISTRY['vowel_surge']['value']]]
+
+
+def test_found_words_are_sent_in_the_order_found():
+    game_state = game.init_game_state()
+    game.start_round(game_state)
+    game_state['goal_score'] = 10 ** 9  # Stay in the round
+    words = list(game.solve_board(game_state['grid'])['words'])[:3]
+    revision = game_state['revision']
+    for word in reversed(words):
+        assert game.submit_word_to_state(game_state, word)['success']
+    state = game.client_game_state(game_state)
+    assert state['found_words'] == words[::-1]
+    assert 'found_word_masks' not in state
+    changes = game.game_state_payload(game_state, revision)['changes']
+    assert changes['found_words'] == words[::-1]